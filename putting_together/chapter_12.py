@@ -41,7 +41,7 @@ def run():
 
   for i in range(0, 12):
     cube1 = Cube()
-    cube1.transform =  Matrix.rotation_y((math.pi / 6) * i) * Matrix.translation(5, 0, 0)
+    cube1.transform = Matrix.identity().translate(5, 0, 0).rotate_y((math.pi / 6) * i)
     c = (1 / 16) * (i + 1)
     cube1.material.colour = Colour(0.2, 0, c)
     cube1.material.diffuse = 0.9
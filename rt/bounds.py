@@ -0,0 +1,145 @@
+"""
+Bounds module
+"""
+from __future__ import annotations
+
+import math
+
+from rt.helpers import EPSILON
+from rt.matrix import Matrix
+from rt.tuple import Point
+
+
+class BoundingBox:
+  """
+  Axis aligned bounding box, extents may be infinite for unbounded shapes
+  """
+  def __init__(self, minimum: Point = None, maximum: Point = None) -> BoundingBox:
+    if minimum is None:
+      minimum = Point(math.inf, math.inf, math.inf)
+    if maximum is None:
+      maximum = Point(-math.inf, -math.inf, -math.inf)
+    self.minimum = minimum
+    self.maximum = maximum
+
+  def __eq__(self, other: BoundingBox) -> bool:
+    return self.minimum == other.minimum and self.maximum == other.maximum
+
+  def is_finite(self) -> bool:
+    """ true when every extent of the box is finite """
+    return all(math.isfinite(value) for value in (
+      self.minimum.x, self.minimum.y, self.minimum.z,
+      self.maximum.x, self.maximum.y, self.maximum.z))
+
+  def add_point(self, p: Point) -> None:
+    """ grow the box to contain a point """
+    self.minimum = Point(min(self.minimum.x, p.x), min(self.minimum.y, p.y), min(self.minimum.z, p.z))
+    self.maximum = Point(max(self.maximum.x, p.x), max(self.maximum.y, p.y), max(self.maximum.z, p.z))
+
+  def add_box(self, box: BoundingBox) -> None:
+    """ grow the box to contain another box """
+    self.add_point(box.minimum)
+    self.add_point(box.maximum)
+
+  def centre(self) -> Point:
+    """ centre of the box """
+    return Point(
+      (self.minimum.x + self.maximum.x) / 2,
+      (self.minimum.y + self.maximum.y) / 2,
+      (self.minimum.z + self.maximum.z) / 2)
+
+  def transform(self, matrix: Matrix) -> BoundingBox:
+    """
+    box containing this box after transforming it by the matrix
+
+    each output extent sums the smaller and larger product of every matrix
+    element with the input extents, skipping zero elements so an infinite
+    extent never multiplies to nan. the result is padded by EPSILON so it
+    stays conservative under rounding.
+    """
+    minimum = [self.minimum.x, self.minimum.y, self.minimum.z]
+    maximum = [self.maximum.x, self.maximum.y, self.maximum.z]
+    new_minimum = []
+    new_maximum = []
+    for row in range(0, 3):
+      low = high = matrix[row][3]
+      for col in range(0, 3):
+        element = matrix[row][col]
+        if element == 0:
+          continue
+        a = element * minimum[col]
+        b = element * maximum[col]
+        low += min(a, b)
+        high += max(a, b)
+      new_minimum.append(low - EPSILON)
+      new_maximum.append(high + EPSILON)
+    return BoundingBox(
+      Point(new_minimum[0], new_minimum[1], new_minimum[2]),
+      Point(new_maximum[0], new_maximum[1], new_maximum[2]))
+
+  def intersects( # pylint: disable=too-many-branches,too-many-return-statements
+    self,
+    ox: float, oy: float, oz: float,
+    dx: float, dy: float, dz: float,
+    t_low: float = -math.inf,
+    t_high: float = math.inf) -> bool:
+    """
+    slab test of the ray between t_low and t_high against the box
+
+    by default the whole line through the ray is tested, intersections
+    behind the ray origin are still needed to track refractive containers
+    """
+    minimum = self.minimum
+    maximum = self.maximum
+    tmin = t_low
+    tmax = t_high
+
+    # unrolled per axis with plain comparisons rather than min() and max(),
+    # this runs for every shape a ray might hit
+    # pylint: disable=consider-using-max-builtin,consider-using-min-builtin
+    if dx == 0:
+      if ox < minimum.x or ox > maximum.x:
+        return False
+    else:
+      t0 = (minimum.x - ox) / dx
+      t1 = (maximum.x - ox) / dx
+      if t0 > t1:
+        t0, t1 = t1, t0
+      if t0 > tmin:
+        tmin = t0
+      if t1 < tmax:
+        tmax = t1
+      if tmin > tmax:
+        return False
+
+    if dy == 0:
+      if oy < minimum.y or oy > maximum.y:
+        return False
+    else:
+      t0 = (minimum.y - oy) / dy
+      t1 = (maximum.y - oy) / dy
+      if t0 > t1:
+        t0, t1 = t1, t0
+      if t0 > tmin:
+        tmin = t0
+      if t1 < tmax:
+        tmax = t1
+      if tmin > tmax:
+        return False
+
+    if dz == 0:
+      if oz < minimum.z or oz > maximum.z:
+        return False
+    else:
+      t0 = (minimum.z - oz) / dz
+      t1 = (maximum.z - oz) / dz
+      if t0 > t1:
+        t0, t1 = t1, t0
+      if t0 > tmin:
+        tmin = t0
+      if t1 < tmax:
+        tmax = t1
+      if tmin > tmax:
+        return False
+
+    return True
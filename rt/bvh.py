@@ -0,0 +1,180 @@
+"""
+Bounding volume hierarchy module
+"""
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+from rt.bounds import BoundingBox
+from rt.intersection import Intersection
+
+if TYPE_CHECKING:
+  from rt.ray import Ray
+  from rt.shape import Shape
+
+
+class BVHNode:
+  """
+  BVHNode, a leaf holds shapes and an inner node holds two children
+  """
+  def __init__(
+    self,
+    box: BoundingBox,
+    shapes: list[Shape] = None,
+    left: BVHNode = None,
+    right: BVHNode = None) -> BVHNode:
+    self.box = box
+    self.shapes = shapes
+    self.left = left
+    self.right = right
+
+class BVH:
+  """
+  BVH over the world space bounds of a list of shapes
+
+  shapes with an infinite extent, like planes, cannot be split into the
+  tree and are tested against every ray
+  """
+  def __init__(self, shapes: list[Shape], leaf_size: int = 2) -> BVH:
+    self.leaf_size = leaf_size
+    self.unbounded: list[Shape] = []
+    bounded: list[tuple[Shape, BoundingBox]] = []
+    for shape in shapes:
+      box = shape.bounds()
+      if box.is_finite():
+        bounded.append((shape, box))
+      else:
+        self.unbounded.append(shape)
+
+    self.root: BVHNode = None
+    if len(bounded) > 0:
+      self.root = self._build(bounded)
+
+  def _build(self, bounded: list[tuple[Shape, BoundingBox]]) -> BVHNode:
+    """ split the shapes at the median centre along the widest axis """
+    box = BoundingBox()
+    for _, shape_box in bounded:
+      box.add_box(shape_box)
+
+    if len(bounded) <= self.leaf_size:
+      return BVHNode(box, shapes=[shape for shape, _ in bounded])
+
+    centres = BoundingBox()
+    for _, shape_box in bounded:
+      centres.add_point(shape_box.centre())
+    extents = (
+      centres.maximum.x - centres.minimum.x,
+      centres.maximum.y - centres.minimum.y,
+      centres.maximum.z - centres.minimum.z)
+    axis = extents.index(max(extents))
+
+    bounded = sorted(bounded, key=lambda item: (item[1].centre().x, item[1].centre().y, item[1].centre().z)[axis])
+    middle = len(bounded) // 2
+    return BVHNode(box, left=self._build(bounded[:middle]), right=self._build(bounded[middle:]))
+
+  def intersect(self, ray: Ray) -> list[Intersection]:
+    """
+    unsorted intersections of the ray with every shape whose bounds it crosses
+
+    each shape's own box is slab tested before its intersect, which would
+    transform the ray into object space. unbounded shapes still have
+    finite extents on some axes, a cylinder's x and z or a plane's y.
+    """
+    xs = []
+    ox, oy, oz = ray.origin.x, ray.origin.y, ray.origin.z
+    dx, dy, dz = ray.direction.x, ray.direction.y, ray.direction.z
+    for shape in self.unbounded:
+      if shape.bounds().intersects(ox, oy, oz, dx, dy, dz):
+        xs.extend(shape.intersect(ray).xs)
+
+    if self.root is None:
+      return xs
+
+    stack = [self.root]
+    while stack:
+      node = stack.pop()
+      if not node.box.intersects(ox, oy, oz, dx, dy, dz):
+        continue
+      if node.shapes is not None:
+        for shape in node.shapes:
+          if len(node.shapes) == 1 or shape.bounds().intersects(ox, oy, oz, dx, dy, dz):
+            xs.extend(shape.intersect(ray).xs)
+      else:
+        stack.append(node.right)
+        stack.append(node.left)
+
+    return xs
+
+  def closest(self, ray: Ray) -> Intersection|None:
+    """
+    only the nearest intersection with t >= 0, boxes beyond the nearest
+    t found so far are skipped and only the hit becomes an Intersection
+    """
+    ox, oy, oz = ray.origin.x, ray.origin.y, ray.origin.z
+    dx, dy, dz = ray.direction.x, ray.direction.y, ray.direction.z
+    nearest = math.inf
+    nearest_shape = None
+    for shape in self.unbounded:
+      if shape.bounds().intersects(ox, oy, oz, dx, dy, dz, 0, nearest):
+        t = self._nearest(shape, ray, nearest)
+        if t < nearest:
+          nearest, nearest_shape = t, shape
+
+    stack = [] if self.root is None else [self.root]
+    while stack:
+      node = stack.pop()
+      if not node.box.intersects(ox, oy, oz, dx, dy, dz, 0, nearest):
+        continue
+      if node.shapes is not None:
+        for shape in node.shapes:
+          if len(node.shapes) == 1 or shape.bounds().intersects(ox, oy, oz, dx, dy, dz, 0, nearest):
+            t = self._nearest(shape, ray, nearest)
+            if t < nearest:
+              nearest, nearest_shape = t, shape
+      else:
+        stack.append(node.right)
+        stack.append(node.left)
+
+    if nearest_shape is None:
+      return None
+    return Intersection(nearest, nearest_shape)
+
+  @staticmethod
+  def _nearest(shape: Shape, ray: Ray, nearest: float) -> float:
+    """ lowest t of the shape in [0, nearest), otherwise nearest """
+    for t in shape.local_intersect(ray.transform(shape.transform.inverse)):
+      if 0 <= t < nearest:
+        nearest = t
+    return nearest
+
+  def occluded(self, ray: Ray, distance: float) -> bool:
+    """
+    any hit query, true as soon as one shape crosses the ray within
+    [0, distance). no intersections are built and boxes are only tested
+    over that segment of the ray.
+    """
+    ox, oy, oz = ray.origin.x, ray.origin.y, ray.origin.z
+    dx, dy, dz = ray.direction.x, ray.direction.y, ray.direction.z
+    for shape in self.unbounded:
+      if shape.bounds().intersects(ox, oy, oz, dx, dy, dz, 0, distance) and shape.occludes(ray, distance):
+        return True
+
+    if self.root is None:
+      return False
+
+    stack = [self.root]
+    while stack:
+      node = stack.pop()
+      if not node.box.intersects(ox, oy, oz, dx, dy, dz, 0, distance):
+        continue
+      if node.shapes is not None:
+        for shape in node.shapes:
+          if len(node.shapes) == 1 or shape.bounds().intersects(ox, oy, oz, dx, dy, dz, 0, distance):
+            if shape.occludes(ray, distance):
+              return True
+      else:
+        stack.append(node.right)
+        stack.append(node.left)
+
+    return False
@@ -3,14 +3,19 @@ Camera module
 """
 from __future__ import annotations
 
+import json
 import math
+import os
+import time
 from multiprocessing import Pool
+from typing import BinaryIO, Iterator
 
 #import rt
 from rt.canvas import Canvas
 from rt.matrix import Matrix
+from rt.png import PNGWriter
 from rt.ray import Ray
-from rt.tuple import Point
+from rt.tuple import Point, Vector
 from rt.world import World
 
 
@@ -20,15 +25,50 @@ def pixel_render(x, y, camera, world, image):
   colour = world.colour_at(ray)
   image.write_pixel(x, y, colour)
 
-def pixel_render_row(x_max, y, camera, world):
-  """ render a single row for parallel testing """
-  row_data = []
-  for x in range(0,x_max):
-    ray = camera.ray_for_pixel(x, y)
-    colour = world.colour_at(ray)
-    row_data.append(colour)
-    #image.write_pixel(x, y, colour)
-  return row_data
+# scene held by each pool worker, set once by init_render_worker
+_worker_scene = {}
+
+def init_render_worker(camera, world, image):
+  """ pool initializer, receives the camera, world and shared canvas once per worker """
+  _worker_scene["camera"] = camera
+  _worker_scene["world"] = world
+  _worker_scene["image"] = image
+
+def worker_write_tile(tile):
+  """ render a tile straight into the shared canvas, returning only its bounds """
+  camera = _worker_scene["camera"]
+  world = _worker_scene["world"]
+  image = _worker_scene["image"]
+  for x, y, ray in camera.rays(tile):
+    image.write_pixel(x, y, world.colour_at(ray))
+  return tile
+
+def worker_tile_task(tile):
+  """
+  render a tile, returning its bounds with the number of light
+  evaluations the worker's copy of the world culled for the tile
+  """
+  world = _worker_scene["world"]
+  culled = world.culled_light_evaluations
+  worker_write_tile(tile)
+  return tile, world.culled_light_evaluations - culled
+
+def hilbert_index(n: int, x: int, y: int) -> int:
+  """ distance of x,y along the hilbert curve filling an n by n grid """
+  d = 0
+  s = n // 2
+  while s > 0:
+    rx = 1 if x & s else 0
+    ry = 1 if y & s else 0
+    d += s * s * ((3 * rx) ^ ry)
+    # rotate the quadrant so the curve stays continuous
+    if ry == 0:
+      if rx == 1:
+        x = n - 1 - x
+        y = n - 1 - y
+      x, y = y, x
+    s //= 2
+  return d
 
 class Camera:
   """
@@ -50,6 +90,17 @@ class Camera:
       self.half_height = half_view
     self.pixel_size = (self.half_width * 2) / self.hsize
 
+  @property
+  def transform(self) -> Matrix:
+    """ view transform, its inverse and the ray origin are kept with it """
+    return self._transform
+
+  @transform.setter
+  def transform(self, transform: Matrix) -> None:
+    self._transform = transform
+    self._inverse = transform.inverse
+    self._origin = self._inverse * Point(0, 0, 0)
+
   def ray_for_pixel(self, px, py) -> Ray:
     """ get a ray from camera to an x,y on the canvas """
     xoffset = (px + 0.5) * self.pixel_size
@@ -58,11 +109,40 @@ class Camera:
     world_x = self.half_width - xoffset
     world_y = self.half_height - yoffset
 
-    pixel = self.transform.inverse * Point(world_x, world_y, -1)
-    origin = self.transform.inverse * Point(0, 0, 0)
-    direction = (pixel - origin).normalize()
+    pixel = self._inverse * Point(world_x, world_y, -1)
+    direction = (pixel - self._origin).normalize()
 
-    return Ray(origin, direction)
+    return Ray(self._origin, direction)
+
+  def rays(self, tile: tuple[int, int, int, int] = None) -> Iterator[tuple[int, int, Ray]]:
+    """
+    x, y and ray of every pixel in a tile, or the whole canvas, row by row
+
+    the same rays as ray_for_pixel, with the canvas offsets and the row
+    terms of the inverse transform worked out once per column and row
+    rather than once per pixel
+    """
+    x_min, y_min, x_max, y_max = (0, 0, self.hsize, self.vsize) if tile is None else tile
+    (m00, m01, m02, m03), (m10, m11, m12, m13), (m20, m21, m22, m23), (m30, m31, m32, m33) = self._inverse.rows
+    origin = self._origin
+    ox, oy, oz, ow = origin.x, origin.y, origin.z, origin.w
+    columns = [(x, self.half_width - (x + 0.5) * self.pixel_size) for x in range(x_min, x_max)]
+
+    for y in range(y_min, y_max):
+      world_y = self.half_height - (y + 0.5) * self.pixel_size
+      x_row = m01 * world_y
+      y_row = m11 * world_y
+      z_row = m21 * world_y
+      w_row = m31 * world_y
+      for x, world_x in columns:
+        # the inverse times the pixel at z = -1, w = 1, summed in the
+        # same order as Matrix * Tuple so the rays match exactly
+        dx = m00 * world_x + x_row - m02 + m03 - ox
+        dy = m10 * world_x + y_row - m12 + m13 - oy
+        dz = m20 * world_x + z_row - m22 + m23 - oz
+        dw = m30 * world_x + w_row - m32 + m33 - ow
+        magnitude = math.sqrt(dx ** 2 + dy ** 2 + dz ** 2 + dw ** 2)
+        yield x, y, Ray(origin, Vector(dx / magnitude, dy / magnitude, dz / magnitude))
 
   def single_pixel(self, world: World, x: int, y: int) -> None:
     """ debug a single pixel """
@@ -71,27 +151,159 @@ class Camera:
 
 
 
-  def render_parallel(self, world: World) -> Canvas:
+  def tiles(self, tile_size: int = 16, order: str = "spiral") -> list[tuple[int, int, int, int]]:
+    """
+    split the canvas into (x_min, y_min, x_max, y_max) tiles
+
+    order is "scanline", "spiral" (outwards from the centre) or "hilbert"
+    """
+    columns = math.ceil(self.hsize / tile_size)
+    rows = math.ceil(self.vsize / tile_size)
+    grid = [(column, row) for row in range(0, rows) for column in range(0, columns)]
+
+    if order == "spiral":
+      centre_x = (columns - 1) / 2
+      centre_y = (rows - 1) / 2
+      def spiral_key(cell):
+        dx = cell[0] - centre_x
+        dy = cell[1] - centre_y
+        return (max(abs(dx), abs(dy)), math.atan2(dy, dx))
+      grid.sort(key=spiral_key)
+    elif order == "hilbert":
+      n = 1
+      while n < max(columns, rows):
+        n *= 2
+      grid.sort(key=lambda cell: hilbert_index(n, cell[0], cell[1]))
+    elif order != "scanline":
+      raise ValueError(f"Unknown tile order {order}")
+
+    return [
+      (column * tile_size,
+       row * tile_size,
+       min((column + 1) * tile_size, self.hsize),
+       min((row + 1) * tile_size, self.vsize))
+      for column, row in grid
+    ]
+
+  def render_parallel(
+    self,
+    world: World,
+    processes: int = None,
+    tile_size: int = 16,
+    order: str = "spiral") -> Canvas:
     """ parallel render """
-    image = Canvas(self.hsize, self.vsize)
+    image = Canvas(self.hsize, self.vsize, shared=True)
+
+    try:
+      # workers write straight into the shared canvas and only return tile bounds
+      for _ in self._render_tiles(world, processes, self.tiles(tile_size, order), image):
+        pass
+    finally:
+      image.release_shared()
+
+    return image
+
+  def render_to_file(
+    self,
+    world: World,
+    path: str,
+    processes: int = None,
+    tile_size: int = 16,
+    order: str = "spiral") -> Canvas:
+    """
+    parallel render into a memory mapped canvas file, workers map the
+    same file and write each tile straight to it. the canvas is returned
+    still mapped, close() it once it has been exported.
+    """
+    image = Canvas(self.hsize, self.vsize, path=path)
+
+    try:
+      for _ in self._render_tiles(world, processes, self.tiles(tile_size, order), image):
+        pass
+    finally:
+      image.flush()
+
+    return image
+
+  def render_resumable(
+    self,
+    world: World,
+    path: str,
+    processes: int = None,
+    tile_size: int = 16,
+    order: str = "spiral",
+    checkpoint_seconds: float = 10.0) -> Canvas:
+    """
+    render into a memory mapped canvas file, resuming the tiles its path + ".json"
+    manifest lists as finished. the canvas is returned still mapped
+    """
+    manifest_path = path + ".json"
+    # only JSON types, lists not tuples, so it compares equal to the saved manifest
+    manifest = {
+      "scene": world.digest(),
+      "camera": {
+        "hsize": self.hsize,
+        "vsize": self.vsize,
+        "field_of_view": self.field_of_view,
+        "transform": [list(row) for row in self.transform.rows]},
+      "tile_size": tile_size}
+
+    completed = set()
+    saved = None
+    if os.path.exists(manifest_path):
+      with open(manifest_path, "r", encoding="utf-8") as manifest_file:
+        saved = json.load(manifest_file)
+    if saved is not None and os.path.exists(path) and all(saved.get(key) == value for key, value in manifest.items()):
+      completed = {tuple(tile) for tile in saved["completed"]}
+    else:
+      # drop the old manifest before the canvas starts over, a kill before
+      # the first checkpoint must not leave it listing tiles of the old canvas
+      if saved is not None:
+        os.remove(manifest_path)
+      if os.path.exists(path):
+        os.remove(path)
 
-    #coordinates = ((x, y, self, world, image) for x in range(self.hsize) for y in range(self.vsize))
-    coordinates = ((self.hsize, y, self, world) for y in range(self.vsize))
-    with Pool() as pool:
-      pool.starmap(pixel_render_row, coordinates)
-      # row_data = pool.starmap(pixel_render_row, coordinates)
+    def checkpoint() -> None:
+      image.flush()
+      manifest["completed"] = sorted(completed)
+      with open(manifest_path + ".tmp", "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file)
+      os.replace(manifest_path + ".tmp", manifest_path)
+
+    image = Canvas(self.hsize, self.vsize, path=path)
+    tiles = [tile for tile in self.tiles(tile_size, order) if tile not in completed]
+    last_checkpoint = time.monotonic()
+    try:
+      for tile in self._render_tiles(world, processes, tiles, image) if tiles else []:
+        completed.add(tile)
+        if time.monotonic() - last_checkpoint >= checkpoint_seconds:
+          checkpoint()
+          last_checkpoint = time.monotonic()
+    finally:
+      checkpoint()
 
     return image
 
+  def _render_tiles(
+    self,
+    world: World,
+    processes: int,
+    tiles: list[tuple[int, int, int, int]],
+    image: Canvas):
+    """ render tiles into the canvas across a process pool, yielding each as it completes """
+    with Pool(processes, initializer=init_render_worker, initargs=(self, world, image)) as pool:
+      for tile, culled in pool.imap_unordered(worker_tile_task, tiles, chunksize=1):
+        # fold the workers' culling counts into the caller's world
+        world.culled_light_evaluations += culled
+        yield tile
+
   def render(self, world: World) -> Canvas:
     """ render the image """
     image = Canvas(self.hsize, self.vsize)
 
-    for y in range(0, self.vsize):
-      for x in range(0, self.hsize):
-        ray = self.ray_for_pixel(x, y)
-        colour = world.colour_at(ray)
-        image.write_pixel(x, y, colour)
+    for x, y, ray in self.rays():
+      colour = world.colour_at(ray)
+      image.write_pixel(x, y, colour)
 
     return image
 
@@ -99,10 +311,20 @@ class Camera:
     """ render the PNG image """
     image = Canvas(self.hsize, self.vsize)
 
-    for y in range(0, self.vsize):
-      for x in range(0, self.hsize):
-        ray = self.ray_for_pixel(x, y)
-        colour = world.colour_at(ray)
-        image.write_pixel_png(x, y, colour)
+    for x, y, ray in self.rays():
+      colour = world.colour_at(ray)
+      image.write_pixel(x, y, colour)
 
     return image
+
+  def render_png_stream(self, world: World, output_stream: BinaryIO, flush_rows: int = 16) -> None:
+    """
+    render the PNG image straight to a stream, each row is encoded as soon
+    as it is finished and only one row of pixels is held in memory
+    """
+    row = Canvas(self.hsize, 1)
+    with PNGWriter(output_stream, self.hsize, self.vsize, flush_rows) as writer:
+      for x, _, ray in self.rays():
+        row.write_pixel(x, 0, world.colour_at(ray))
+        if x == self.hsize - 1:
+          writer.write_row(row.png_row(0))
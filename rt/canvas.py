@@ -3,85 +3,136 @@ Canvas module
 """
 from __future__ import annotations
 
-import binascii
-import zlib
+import mmap
+import os
+import sys
+from array import array
 from io import StringIO, TextIOWrapper
-from typing import BinaryIO
+from multiprocessing.shared_memory import SharedMemory
+from typing import BinaryIO, Iterable
 
 #import rt
 from rt.colour import Colour
+from rt.png import PNGWriter
 
 
 class Canvas:
   """
   Canvas
+
+  float32 RGB pixels held in memory, in shared memory or in a memory mapped file
   """
-  def __init__(self, width: int, height: int) -> None:
+  def __init__(self, width: int, height: int, shared: bool = False, path: str = None) -> None:
     self.width = width
     self.height = height
-    colour = Colour(0, 0, 0)
-    self._canvas = [colour for x in range(self.width * self.height)]
-    # data size: width * (3bytes R G B) + (1 byte per row for PNG filter method)
-    self._data = bytearray((self.width * 3 + 1) * self.height)
+    self.path = path
+    self._mmap: mmap.mmap = None
+    self._shared_memory = None
+    self._shared_owner = shared
+    if path is not None:
+      self._map_file()
+    elif shared:
+      self._shared_memory = SharedMemory(create=True, size=self._pixels_size())
+      self._pixels = self._shared_memory.buf[:self._pixels_size()].cast("f")
+    else:
+      self._pixels = array("f", bytes(self._pixels_size()))
+
+  def _pixels_size(self) -> int:
+    """ size in bytes of the float32 pixels """
+    return self.width * self.height * 3 * array("f").itemsize
+
+  def _map_file(self) -> None:
+    """ map the pixel file, creating it if it does not exist """
+    size = self._pixels_size()
+    fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+      file_size = os.fstat(fd).st_size
+      if file_size == 0:
+        os.ftruncate(fd, size)
+      elif file_size != size:
+        raise ValueError(f"{self.path} is {file_size} bytes, a {self.width}x{self.height} canvas is {size}")
+      self._mmap = mmap.mmap(fd, size)
+    finally:
+      os.close(fd)
+    self._pixels = memoryview(self._mmap).cast("f")
+
+  def __getstate__(self) -> dict:
+    state = self.__dict__.copy()
+    if self._mmap is not None:
+      # send the path, the receiving process maps the same file
+      state["_mmap"] = None
+      state["_pixels"] = None
+    if self._shared_memory is not None:
+      # send the block name, the receiving process attaches to it
+      state["_shared_memory"] = self._shared_memory.name
+      state["_shared_owner"] = False
+      state["_pixels"] = None
+    return state
+
+  def __setstate__(self, state: dict) -> None:
+    self.__dict__.update(state)
+    if self.path is not None:
+      self._map_file()
+    if self._shared_memory is not None:
+      self._shared_memory = SharedMemory(name=self._shared_memory)
+      self._pixels = self._shared_memory.buf[:self._pixels_size()].cast("f")
+
+  def release_shared(self) -> None:
+    """
+    copy the pixels out of shared memory and detach from the shared block,
+    freeing it if this canvas created it
+    """
+    if self._shared_memory is None:
+      return
+    pixels = array("f", self._pixels.tobytes())
+    self._pixels.release()
+    self._pixels = pixels
+    self._shared_memory.close()
+    if self._shared_owner:
+      self._shared_memory.unlink()
+    self._shared_memory = None
+
+  def flush(self) -> None:
+    """ write a memory mapped canvas's pixels through to its file """
+    if self._mmap is not None:
+      self._mmap.flush()
+
+  def close(self) -> None:
+    """ unmap a memory mapped canvas, its pixels stay in the file """
+    if self._mmap is None:
+      return
+    self._pixels.release()
+    self._mmap.close()
+    self._mmap = None
 
   def write_pixel(self, x: int, y: int, colour: Colour) -> None:
     """ write a pixel to the canvas """
-    self._canvas[y * self.width + x] = colour
-
-  def write_pixel_png(self, x: int, y: int, colour: Colour) -> None:
-    """ write a pixel to the PNG canvas """
-    pos = y * (self.width * 3 + 1) + (x * 3) + 1
+    pos = (y * self.width + x) * 3
+    self._pixels[pos] = colour.red
+    self._pixels[pos + 1] = colour.green
+    self._pixels[pos + 2] = colour.blue
 
-    # clamp colour bytes to 0-1 and scale to 0-255
-    self._data[pos] = round(max(min(1, colour.red), 0) * 255)
-    self._data[pos + 1] = round(max(min(1, colour.green), 0) * 255)
-    self._data[pos + 2] = round(max(min(1, colour.blue), 0) * 255)
+  def png_row(self, y: int) -> bytes:
+    """ the RGB bytes of a row of the PNG canvas """
+    return bytes(self._rgb_row(y))
 
   def pixel_at(self, x: int, y: int) -> Colour:
     """ read a pixel from the canvas """
-    return self._canvas[y * self.width + x]
+    pos = (y * self.width + x) * 3
+    return Colour(self._pixels[pos], self._pixels[pos + 1], self._pixels[pos + 2])
 
   def canvas_to_png(self, output_stream: BinaryIO) -> None:
-    """ output canvas in PNG format"""
-
-    def write_chunk(chunk_type: str, chunk_data: bytes) -> None:
-      """ chunk """
-      chunk_data_length = len(chunk_data)
-      output_stream.write(chunk_data_length.to_bytes(4, "big"))
-
-      chunk_type_bytes = bytes(chunk_type, "ascii")
-      output_stream.write(chunk_type_bytes)
-      output_stream.write(chunk_data)
-
-      crc = binascii.crc32(chunk_type_bytes)
-      crc = binascii.crc32(chunk_data, crc)
-      output_stream.write(crc.to_bytes(4, "big"))
-
-    # PNG Header
-    output_stream.write(b"\x89\x50\x4E\x47\x0D\x0A\x1A\x0A")
-
-    # IHDR
-    ihdr_data = bytearray() # (13 data bytes total)
-    ihdr_data.extend(self.width.to_bytes(4, "big")) # width (4 bytes)
-    ihdr_data.extend(self.height.to_bytes(4, "big")) # height (4 bytes)
-    ihdr_data.extend((8).to_bytes(1, "big")) # bit depth (1 byte, values 1, 2, 4, 8, or 16)
-    ihdr_data.extend((2).to_bytes(1, "big")) # 2 (010) red, green and blue: rgb/truecolor
-    ihdr_data.extend((0).to_bytes(1, "big")) # compression method (1 byte, value 0)
-    ihdr_data.extend((0).to_bytes(1, "big")) # filter method (1 byte, value 0)
-    ihdr_data.extend((0).to_bytes(1, "big")) # interlace method (1 byte, values 0 "no interlace" or 1 "Adam7 interlace")
-    write_chunk("IHDR", bytes(ihdr_data))
-
-    # IDAT
-    # write filter method 0 byte to start each scanline
-    for y in range(0, self.height):
-      pos = y * (self.width * 3 + 1) + 0
-      self._data[pos] = 0
-
-    compressed_data = zlib.compress(self._data)
-    write_chunk("IDAT", compressed_data)
-
-    # IEND
-    write_chunk("IEND", bytes())
+    """ output canvas in PNG format, quantising and compressing a row at a time """
+    with PNGWriter(output_stream, self.width, self.height, flush_rows=0) as writer:
+      for y in range(0, self.height):
+        writer.write_row(self._rgb_row(y))
+
+  def _rgb_row(self, y: int) -> bytearray:
+    """ RGB bytes of a row, clamped to 0-1 and scaled to 0-255 """
+    # NaN fails both comparisons and comes out as 255
+    return bytearray([
+      0 if value <= 0 else round(value * 255) if value < 1 else 255
+      for value in self._pixels[y * self.width * 3:(y + 1) * self.width * 3]])
 
   def canvas_to_ppm(self, output_stream: StringIO|TextIOWrapper) -> None:
     """ output canvas in PPM format """
@@ -89,32 +140,80 @@ class Canvas:
     output_stream.write(f"{self.width} {self.height}\n")
     output_stream.write("255\n")
 
-    row_counter = 0
     row_max = 70
 
-    def write_value(value: float, row_counter: int) -> int:
-      value = max(min(1, value), 0)
-      value = round(value * 255)
-      value_str = str(value)
-      if row_counter > 0:
-        value_str = " " + value_str
-
-      if row_counter + len(value_str) > row_max:
-        output_stream.write("\n")
-        row_counter = 0
-        value_str = value_str.lstrip()
-
-      output_stream.write(value_str)
-      row_counter += len(value_str)
-
-      return row_counter
-
+    # each row is formatted whole, then broken at the last space that
+    # keeps a line within row_max characters
     for y in range(0, self.height):
-      for x in range(0, self.width):
-        pixel = self.pixel_at(x, y)
-        row_counter = write_value(pixel.red, row_counter)
-        row_counter = write_value(pixel.green, row_counter)
-        row_counter = write_value(pixel.blue, row_counter)
+      line = " ".join(map(str, self._rgb_row(y)))
+      lines = []
+      while len(line) > row_max:
+        split = line.rfind(" ", 0, row_max + 1)
+        lines.append(line[:split])
+        line = line[split + 1:]
+      lines.append(line)
+      output_stream.write("\n".join(lines))
       output_stream.write("\n")
-      row_counter = 0
     output_stream.write("\n")
+
+  def canvas_to_ppm_binary(self, output_stream: BinaryIO) -> None:
+    """ output canvas in binary P6 PPM format """
+    data = bytearray(f"P6\n{self.width} {self.height}\n255\n", "ascii")
+    self._write_rows(output_stream, data, (self._rgb_row(y) for y in range(0, self.height)))
+
+  def canvas_to_pfm(self, output_stream: BinaryIO) -> None:
+    """
+    output canvas in PFM format, the linear float32 pixels unclamped
+
+    PFM stores rows bottom to top, a negative scale marks little endian data
+    """
+    scale = "-1.0" if sys.byteorder == "little" else "1.0"
+    data = bytearray(f"PF\n{self.width} {self.height}\n{scale}\n", "ascii")
+    row_size = self.width * 3
+    self._write_rows(output_stream, data,
+      (self._pixels[y * row_size:(y + 1) * row_size].tobytes() for y in range(self.height - 1, -1, -1)))
+
+  def _write_rows(self, output_stream: BinaryIO, data: bytearray, rows: Iterable[bytes]) -> None:
+    """
+    write data followed by rows, in one write for an in memory canvas but a
+    row at a time for a memory mapped one, which may not fit in memory whole
+    """
+    for row in rows:
+      data.extend(row)
+      if self._mmap is not None:
+        output_stream.write(data)
+        data.clear()
+    if len(data) > 0:
+      output_stream.write(data)
+
+  @classmethod
+  def from_pfm(cls, input_stream: BinaryIO) -> Canvas:
+    """ read a canvas from PFM data, colour (PF) or greyscale (Pf) """
+    kind = input_stream.readline().strip()
+    if kind not in (b"PF", b"Pf"):
+      raise ValueError(f"Not a PFM image, header {kind!r}")
+    try:
+      width, height = (int(value) for value in input_stream.readline().split())
+      scale = float(input_stream.readline())
+    except ValueError as e:
+      raise ValueError("Invalid PFM header") from e
+
+    channels = 3 if kind == b"PF" else 1
+    values = array("f")
+    data = input_stream.read(width * height * channels * values.itemsize)
+    if len(data) != width * height * channels * values.itemsize:
+      raise ValueError(f"PFM data is {len(data)} bytes, expected {width * height * channels * values.itemsize}")
+    values.frombytes(data)
+    if (scale < 0) != (sys.byteorder == "little"):
+      values.byteswap()
+
+    canvas = cls(width, height)
+    row_size = width * channels
+    pos = 0
+    for y in range(height - 1, -1, -1):
+      row = values[y * row_size:(y + 1) * row_size]
+      if channels == 1:
+        row = array("f", (value for value in row for _ in range(0, 3)))
+      canvas._pixels[pos:pos + width * 3] = row
+      pos += width * 3
+    return canvas
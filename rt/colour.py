@@ -11,7 +11,11 @@ from rt.helpers import EPSILON
 class Colour:
   """
   Colours
+
+  the in place operators overwrite a colour, only use them on colours
+  the caller has just created, never a material's or a light's
   """
+  __slots__ = 'red', 'green', 'blue'
   def __init__(self, red: float, green: float, blue: float) -> Colour:
     self.red = red
     self.green = green
@@ -54,6 +58,35 @@ class Colour:
       self.green * other,
       self.blue * other)
 
+  def __iadd__(self, other: Colour):
+    self.red += other.red
+    self.green += other.green
+    self.blue += other.blue
+    return self
+
+  def __imul__(self, other: int|float|Colour):
+    if isinstance(other, Colour):
+      self.red *= other.red
+      self.green *= other.green
+      self.blue *= other.blue
+      return self
+
+    self.red *= other
+    self.green *= other
+    self.blue *= other
+    return self
+
+  def multiply_add(self, other: Colour, scalar: float) -> Colour:
+    """ self + other * scalar without the intermediate colour """
+    return Colour(
+      self.red + other.red * scalar,
+      self.green + other.green * scalar,
+      self.blue + other.blue * scalar)
+
+  def max_channel(self) -> float:
+    """ largest magnitude of the red, green and blue values """
+    return max(abs(self.red), abs(self.green), abs(self.blue))
+
   @classmethod
   def Black(cls):
     """ Black colour constant """
@@ -3,8 +3,11 @@ Cube module
 """
 from __future__ import annotations
 
+import math
+from typing import Sequence
+
+from rt.bounds import BoundingBox
 from rt.helpers import EPSILON
-from rt.intersection import Intersection, Intersections
 from rt.ray import Ray
 from rt.shape import Shape
 from rt.tuple import Point, Vector
@@ -14,6 +17,9 @@ class Cube(Shape):
   """
   Cube
   """
+  def local_bounds(self) -> BoundingBox:
+    return BoundingBox(Point(-1, -1, -1), Point(1, 1, 1))
+
   def local_normal_at(self, local_point: Point) -> Vector:
     maxc = max(abs(local_point.x), abs(local_point.y), abs(local_point.z))
     if maxc == abs(local_point.x):
@@ -22,10 +28,8 @@ class Cube(Shape):
       return Vector(0, local_point.y, 0)
     return Vector(0, 0, local_point.z)
 
-  def intersect(self, ray: Ray) -> Intersections:
-    """ Compute intersections with ray """
-    local_ray = super().intersect(ray)
-
+  def local_intersect(self, local_ray: Ray) -> tuple[float, ...]:
+    """ t values where a ray in object space crosses the cube """
     xtmin, xtmax = self.check_axis(local_ray.origin.x, local_ray.direction.x)
     ytmin, ytmax = self.check_axis(local_ray.origin.y, local_ray.direction.y)
     ztmin, ztmax = self.check_axis(local_ray.origin.z, local_ray.direction.z)
@@ -33,9 +37,36 @@ class Cube(Shape):
     tmax = min(xtmax, ytmax, ztmax)
 
     if tmin > tmax:
-      return Intersections()
+      return ()
+
+    return (tmin, tmax)
+
+  def local_intersect_many(
+    self,
+    origins: Sequence[Sequence[float]],
+    directions: Sequence[Sequence[float]]) -> tuple[list[float], list[float], list[bool]]:
+    """ batch intersect rays already in object space """
+    near = []
+    far = []
+    hits = []
+    check_axis = self.check_axis
+    for (ox, oy, oz, _), (dx, dy, dz, _) in zip(origins, directions):
+      xtmin, xtmax = check_axis(ox, dx)
+      ytmin, ytmax = check_axis(oy, dy)
+      ztmin, ztmax = check_axis(oz, dz)
+      tmin = max(xtmin, ytmin, ztmin)
+      tmax = min(xtmax, ytmax, ztmax)
+
+      if tmin > tmax:
+        near.append(math.inf)
+        far.append(math.inf)
+        hits.append(False)
+      else:
+        near.append(tmin)
+        far.append(tmax)
+        hits.append(True)
 
-    return Intersections(Intersection(tmin, self), Intersection(tmax, self))
+    return near, far, hits
 
   def check_axis(self, origin, direction):
     """ find min and max t values """
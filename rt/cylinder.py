@@ -4,9 +4,10 @@ Cylinder module
 from __future__ import annotations
 
 import math
+from typing import Sequence
 
+from rt.bounds import BoundingBox
 from rt.helpers import EPSILON
-from rt.intersection import Intersection, Intersections
 from rt.ray import Ray
 from rt.shape import Shape
 from rt.tuple import Point, Vector
@@ -16,18 +17,19 @@ class Cylinder(Shape):
   """
   Cylinder
   """
+  def local_bounds(self) -> BoundingBox:
+    return BoundingBox(Point(-1, -math.inf, -1), Point(1, math.inf, 1))
+
   def local_normal_at(self, local_point: Point) -> Vector:
     return Vector(local_point.x, 0, local_point.z)
 
-  def intersect(self, ray: Ray) -> Intersections:
-    """ Compute intersections with ray """
-    local_ray = super().intersect(ray)
-
+  def local_intersect(self, local_ray: Ray) -> tuple[float, ...]:
+    """ t values where a ray in object space crosses the cylinder """
     a = local_ray.direction.x ** 2 + local_ray.direction.z ** 2
 
     # ray is parallel to the y axis
     if math.isclose(a, 0, abs_tol=EPSILON):
-      return Intersections()
+      return ()
 
     b = 2 * local_ray.origin.x * local_ray.direction.x + 2 * local_ray.origin.z * local_ray.direction.z
     c = local_ray.origin.x ** 2 + local_ray.origin.z ** 2 - 1
@@ -36,12 +38,36 @@ class Cylinder(Shape):
 
     # ray does not intersect the cylinder
     if disc < 0:
-      return Intersections()
+      return ()
 
     t0 = (-b - math.sqrt(disc)) / (2 * a)
     t1 = (-b + math.sqrt(disc)) / (2 * a)
 
-    return Intersections(
-      Intersection(t0, self),
-      Intersection(t1, self)
-    )
+    return (t0, t1)
+
+  def local_intersect_many(
+    self,
+    origins: Sequence[Sequence[float]],
+    directions: Sequence[Sequence[float]]) -> tuple[list[float], list[float], list[bool]]:
+    """ batch intersect rays already in object space """
+    near = []
+    far = []
+    hits = []
+    for (ox, _, oz, _), (dx, _, dz, _) in zip(origins, directions):
+      a = dx ** 2 + dz ** 2
+      b = 2 * ox * dx + 2 * oz * dz
+      c = ox ** 2 + oz ** 2 - 1
+      disc = b ** 2 - 4 * a * c
+
+      # ray is parallel to the y axis or does not intersect the cylinder
+      if math.isclose(a, 0, abs_tol=EPSILON) or disc < 0:
+        near.append(math.inf)
+        far.append(math.inf)
+        hits.append(False)
+        continue
+
+      near.append((-b - math.sqrt(disc)) / (2 * a))
+      far.append((-b + math.sqrt(disc)) / (2 * a))
+      hits.append(True)
+
+    return near, far, hits
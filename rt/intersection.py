@@ -4,11 +4,14 @@ Intersection module
 from __future__ import annotations
 
 import math
+from typing import TYPE_CHECKING
 
 from rt.helpers import EPSILON
-from rt.ray import Ray
-from rt.shape import Shape
-from rt.tuple import Point, Vector
+
+if TYPE_CHECKING:
+  from rt.ray import Ray
+  from rt.shape import Shape
+  from rt.tuple import Point, Vector
 
 
 class Comps:
@@ -50,9 +53,14 @@ class Comps:
 class Intersections:
   """
   Intersections
+
+  ordered is set when xs is already sorted by t, like the intersections
+  from World.intersect, so finding the hit needs no sorting
   """
-  def __init__(self, *intersections) -> Intersections:
+  def __init__(self, *intersections, ordered: bool = False) -> Intersections:
     self.xs = list(intersections)
+    self.ordered = ordered
+    self._refraction: dict[int, tuple[float, float]] = None
 
   def __getitem__(self, key: int) -> Intersection:
     return self.xs[key]
@@ -62,17 +70,44 @@ class Intersections:
 
   def hit(self) -> Intersection|None:
     """ return the intersection that is the hit """
-    if len(self.xs) == 0:
+    if self.ordered:
+      for i in self.xs:
+        if i.t >= 0:
+          return i
       return None
 
-    self.xs.sort(key=lambda i: i.t)
+    # one pass for the lowest non-negative t, the first wins a tie
+    hit = None
+    for i in self.xs:
+      if i.t >= 0 and (hit is None or i.t < hit.t):
+        hit = i
+    return hit
+
+  def refractive_indices(self, intersection: Intersection) -> tuple[float, float]:
+    """
+    n1 and n2 either side of one of the intersections
+
+    one walk over xs in order records them for every intersection. the
+    shapes the ray is inside are kept in a dict, shapes hash by identity
+    and its insertion order makes the last entered shape the innermost.
+    """
+    if self._refraction is None:
+      self._refraction = {}
+      containers: dict[Shape, None] = {}
+      n1 = 1.0
+      for i in self.xs:
+        if i.object in containers:
+          del containers[i.object]
+        else:
+          containers[i.object] = None
 
-    # visible = list(filter(lambda i: i.t >= 0, self.xs))
-    visible = [i for i in self.xs if i.t >= 0]
-    if len(visible) == 0:
-      return None
+        n2 = 1.0
+        if containers:
+          n2 = next(reversed(containers)).material.refractive_index
+        self._refraction[id(i)] = (n1, n2)
+        n1 = n2
 
-    return visible[0]
+    return self._refraction[id(intersection)]
 
 class Intersection:
   """
@@ -96,32 +131,14 @@ class Intersection:
 
     if comps.normalv.dot(comps.eyev) < 0:
       comps.inside = True
-      comps.normalv = -comps.normalv
+      comps.normalv *= -1
     else:
       comps.inside = False
 
-    comps.over_point = comps.point + comps.normalv * EPSILON
-    comps.under_point = comps.point - comps.normalv * EPSILON
+    comps.over_point = comps.point.multiply_add(comps.normalv, EPSILON)
+    comps.under_point = comps.point.multiply_add(comps.normalv, -EPSILON)
     comps.reflectv = ray.direction.reflect(comps.normalv)
 
-    containers: list[Shape] = []
-    for i in xs:
-      if i == self:
-        if len(containers) == 0:
-          comps.n1 = 1.0
-        else:
-          comps.n1 = containers[-1].material.refractive_index
-
-      if i.object in containers:
-        containers.remove(i.object)
-      else:
-        containers.append(i.object)
-
-      if i == self:
-        if len(containers) == 0:
-          comps.n2 = 1.0
-        else:
-          comps.n2 = containers[-1].material.refractive_index
-        break
+    comps.n1, comps.n2 = xs.refractive_indices(self)
 
     return comps
@@ -54,6 +54,17 @@ class Material:
         return True
     return False
 
+  def contribution_bound(self) -> float:
+    """
+    largest channel lighting can give for a light of intensity 1, the
+    diffuse and specular terms peak at 1 when facing the light
+    """
+    if self.pattern is None:
+      colour_bound = self.colour.max_channel()
+    else:
+      colour_bound = self.pattern.colour_bound()
+    return colour_bound * (self.ambient + self.diffuse) + self.specular
+
   def lighting(
     self,
     obj: Shape,
@@ -71,11 +82,12 @@ class Material:
     # combine the surface color with the light's color/intensity
     effective_colour = colour * light.intensity
 
-    # compute the ambient contribution
-    ambient = effective_colour * self.ambient
+    # compute the ambient contribution, the diffuse and specular
+    # contributions are added to it in place
+    result = effective_colour * self.ambient
 
     if in_shadow is True:
-      return ambient
+      return result
 
     # find the direction to the light source
     lightv = (light.position - point).normalize()
@@ -85,22 +97,24 @@ class Material:
     # light is on the other side of the surface.
     light_dot_normal = lightv.dot(normalv)
     if light_dot_normal < 0:
-      diffuse = Colour(0, 0, 0)
-      specular = Colour(0, 0, 0)
-    else:
-      # compute the diffuse contribution
-      diffuse = effective_colour * self.diffuse * light_dot_normal
-
-      # reflect_dot_eye represents the cosine of the angle between the
-      # reflection vector and the eye vector. A negative number means the
-      # light reflects away from the eye.
-      reflectv = (-lightv).reflect(normalv)
-      reflect_dot_eye = reflectv.dot(eyev)
-
-      if reflect_dot_eye <= 0:
-        specular = Colour(0, 0, 0)
-      else:
-        factor = pow(reflect_dot_eye, self.shininess)
-        specular = light.intensity * self.specular * factor
-
-    return ambient + diffuse + specular
+      return result
+
+    # compute the diffuse contribution
+    diffuse = effective_colour * self.diffuse
+    diffuse *= light_dot_normal
+    result += diffuse
+
+    # reflect_dot_eye represents the cosine of the angle between the
+    # reflection vector and the eye vector. A negative number means the
+    # light reflects away from the eye.
+    lightv *= -1
+    reflectv = lightv.reflect_into(normalv, lightv)
+    reflect_dot_eye = reflectv.dot(eyev)
+
+    if reflect_dot_eye > 0:
+      factor = pow(reflect_dot_eye, self.shininess)
+      specular = light.intensity * self.specular
+      specular *= factor
+      result += specular
+
+    return result
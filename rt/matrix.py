@@ -4,8 +4,8 @@ Matrix module
 from __future__ import annotations
 
 import math
-from functools import cached_property
-from typing import overload
+from functools import lru_cache
+from typing import Sequence, overload
 
 from rt.helpers import EPSILON
 from rt.tuple import Tuple
@@ -14,18 +14,41 @@ from rt.tuple import Tuple
 class Matrix:
   """
   Matrix
+
+  immutable, rows are stored as tuples so the cached inverse, transpose
+  and determinant can never go stale. identical transforms share one
+  inverse through an interning table. equality is within EPSILON so
+  matrices are not hashable.
   """
-  def __init__(self, rows: list) -> None:
-    self.rows = rows
-    self.size = len(rows)
-    # self._inverse: Matrix
-    # self._transpose: Matrix
-    # self._determinant: int
-
-  def __getitem__(self, key: int) -> list:
+  __slots__ = 'rows', 'size', '_inverse', '_transpose', '_determinant'
+  rows: tuple[tuple, ...]
+  size: int
+  _inverse: Matrix
+  _transpose: Matrix
+  _determinant: float
+
+  def __init__(self, rows: list|tuple, inverse: Matrix = None) -> None:
+    _set = object.__setattr__
+    _set(self, "rows", tuple(tuple(row) for row in rows))
+    _set(self, "size", len(rows))
+    _set(self, "_inverse", inverse)
+    _set(self, "_transpose", None)
+    _set(self, "_determinant", None)
+
+  def __setattr__(self, name: str, value) -> None:
+    raise AttributeError(f"Matrix is immutable, cannot set {name}")
+
+  def __reduce__(self) -> tuple:
+    return (Matrix, (self.rows, self._inverse))
+
+  def __getitem__(self, key: int) -> tuple:
     return self.rows[key]
 
-  def __eq__(self, other: Matrix) -> bool:
+  __hash__ = None
+
+  def __eq__(self, other: object) -> bool:
+    if not isinstance(other, Matrix):
+      return NotImplemented
     if self.size != other.size:
       return False
     for i in range(0, self.size):
@@ -44,21 +67,12 @@ class Matrix:
 
   def __mul__(self, other: Matrix|Tuple) -> Matrix|Tuple:
     if isinstance(other, Matrix):
-      matrix = Matrix.by_size(self.size, self.size)
-      # matrix.rows = [[sum(a * b for a, b in zip(A_row, B_col))
-      #                   for B_col in zip(*other.rows)]
-      #                           for A_row in self.rows]
-
-      for i in range(0, self.size):
-        for j in range(0, self.size):
-          for k in range(0, self.size):
-            matrix.rows[i][j] = matrix.rows[i][j] + self.rows[i][k] * other.rows[k][j]
-
-      # for row in range(0, self.size):
-      #   for col in range(0, self.size):
-      #     matrix[row][col] = self[row][0] * other[0][col] + self[row][1] * other[1][col] + self[row][2] * other[2][col] + self[row][3] * other[3][col]
+      if self.size == 4 and other.size == 4:
+        return self._multiply_4x4(other)
 
-      return matrix
+      return Matrix([[sum(a * b for a, b in zip(A_row, B_col))
+                        for B_col in zip(*other.rows)]
+                                for A_row in self.rows])
 
     if isinstance(other, Tuple):
       x = self.rows[0][0] * other.x + self.rows[0][1] * other.y + self.rows[0][2] * other.z + self.rows[0][3] * other.w
@@ -73,48 +87,48 @@ class Matrix:
 
     raise ValueError("Invalid type to multiply with matrix")
 
-  @cached_property
+  def transform_many(self, tuples: Sequence[Sequence[float]]) -> list[tuple[float, float, float, float]]:
+    """ multiply a 4x4 matrix by a batch of (x, y, z, w) tuples """
+    (m00, m01, m02, m03), (m10, m11, m12, m13), (m20, m21, m22, m23), (m30, m31, m32, m33) = self.rows
+    return [
+      (m00 * x + m01 * y + m02 * z + m03 * w,
+       m10 * x + m11 * y + m12 * z + m13 * w,
+       m20 * x + m21 * y + m22 * z + m23 * w,
+       m30 * x + m31 * y + m32 * z + m33 * w)
+      for x, y, z, w in tuples
+    ]
+
+  @property
   def transpose(self) -> Matrix:
     """ Tranpose matrix """
-    #if self._transpose is not None:
-    #  return self._transpose
-    matrix = Matrix.by_size(self.size, self.size)
-    for row in range(0, self.size):
-      for col in range(0, self.size):
-        matrix[col][row] = self[row][col]
-    #self._transpose = matrix
-    return matrix
+    if self._transpose is None:
+      object.__setattr__(self, "_transpose", Matrix(tuple(zip(*self.rows))))
+    return self._transpose
 
-  @cached_property
+  @property
   def determinant(self) -> int:
     """ Get determinant """
-    #if self._determinant is not None:
-    # return self._determinant
-    if self.size == 2:
-      return self[0][0] * self[1][1] - self[0][1] * self[1][0]
+    if self._determinant is not None:
+      return self._determinant
 
-    det = 0
-    for col in range(0, self.size):
-      det += self[0][col] * self.cofactor(0, col)
-    #self._determinant = det
+    if self.size == 2:
+      det = self[0][0] * self[1][1] - self[0][1] * self[1][0]
+    elif self.size == 4:
+      s, c = Matrix._sub_determinants_4x4(self.rows)
+      det = s[0] * c[5] - s[1] * c[4] + s[2] * c[3] + s[3] * c[2] - s[4] * c[1] + s[5] * c[0]
+    else:
+      det = 0
+      for col in range(0, self.size):
+        det += self[0][col] * self.cofactor(0, col)
+    object.__setattr__(self, "_determinant", det)
     return det
 
   def submatrix(self, remove_row: int, remove_col: int) -> Matrix:
     """ Get submatrix """
-    dest_matrix = Matrix.by_size(self.size - 1, self.size - 1)
-    dest_row = 0
-    dest_col = 0
-    for row in range(0, self.size):
-      if row == remove_row:
-        continue
-      for col in range(0, self.size):
-        if col == remove_col:
-          continue
-        dest_matrix[dest_row][dest_col] = self[row][col]
-        dest_col += 1
-      dest_row += 1
-      dest_col = 0
-    return dest_matrix
+    return Matrix([
+      [value for col, value in enumerate(values) if col != remove_col]
+      for row, values in enumerate(self.rows) if row != remove_row
+    ])
 
   def minor(self, remove_row: int, remove_col: int) -> int:
     """ Return the minor """
@@ -127,57 +141,136 @@ class Matrix:
       return -minor
     return minor
 
-  @cached_property
+  @property
   def inverse(self) -> Matrix:
     """ Return the inverse """
-    # if self._inverse is not None:
-    #   return self._inverse
-
-    determinant = self.determinant
+    inverse = self._inverse
+    if inverse is None:
+      inverse = Matrix._invert(self.rows)
+      object.__setattr__(self, "_inverse", inverse)
+    return inverse
+
+  @staticmethod
+  @lru_cache(maxsize=4096)
+  def _invert(rows: tuple) -> Matrix:
+    """
+    compute the inverse from the cofactors, this is the interning table
+    so identical transforms across shapes share one inverse
+    """
+    matrix = Matrix(rows)
+    determinant = matrix.determinant
     if determinant == 0:
       raise ValueError("Cannot invert matrix with determinant of 0")
 
-    matrix = Matrix.by_size(self.size, self.size)
-    for row in range(0, self.size):
-      for col in range(0, self.size):
-        cofactor = self.cofactor(row, col)
-        matrix[col][row] = cofactor / determinant
+    if matrix.size == 4:
+      return Matrix._inverse_4x4(rows, determinant)
 
-    # self._inverse = matrix
-    return matrix
+    return Matrix([
+      [matrix.cofactor(row, col) / determinant for row in range(0, matrix.size)]
+      for col in range(0, matrix.size)
+    ])
 
-  @classmethod
-  def by_size(cls, rows: int, cols: int):
-    """Helper to return empty Matrix by size"""
-    if rows == 2 and cols == 2:
-      return Matrix([
-        [0,0],
-        [0,0]
-      ])
-    if rows == 3 and cols == 3:
-      return Matrix([
-        [0,0,0],
-        [0,0,0],
-        [0,0,0]
-      ])
-    if rows == 4 and cols == 4:
-      return Matrix([
-        [0,0,0,0],
-        [0,0,0,0],
-        [0,0,0,0],
-        [0,0,0,0]
-      ])
-    return Matrix([[0 for i in range(cols)] for j in range(rows)])
+  def _multiply_4x4(self, other: Matrix) -> Matrix:
+    """ unrolled 4x4 matrix product """
+    (a00, a01, a02, a03), (a10, a11, a12, a13), (a20, a21, a22, a23), (a30, a31, a32, a33) = self.rows
+    (b00, b01, b02, b03), (b10, b11, b12, b13), (b20, b21, b22, b23), (b30, b31, b32, b33) = other.rows
+    return Matrix([
+      [
+        a00 * b00 + a01 * b10 + a02 * b20 + a03 * b30,
+        a00 * b01 + a01 * b11 + a02 * b21 + a03 * b31,
+        a00 * b02 + a01 * b12 + a02 * b22 + a03 * b32,
+        a00 * b03 + a01 * b13 + a02 * b23 + a03 * b33
+      ],
+      [
+        a10 * b00 + a11 * b10 + a12 * b20 + a13 * b30,
+        a10 * b01 + a11 * b11 + a12 * b21 + a13 * b31,
+        a10 * b02 + a11 * b12 + a12 * b22 + a13 * b32,
+        a10 * b03 + a11 * b13 + a12 * b23 + a13 * b33
+      ],
+      [
+        a20 * b00 + a21 * b10 + a22 * b20 + a23 * b30,
+        a20 * b01 + a21 * b11 + a22 * b21 + a23 * b31,
+        a20 * b02 + a21 * b12 + a22 * b22 + a23 * b32,
+        a20 * b03 + a21 * b13 + a22 * b23 + a23 * b33
+      ],
+      [
+        a30 * b00 + a31 * b10 + a32 * b20 + a33 * b30,
+        a30 * b01 + a31 * b11 + a32 * b21 + a33 * b31,
+        a30 * b02 + a31 * b12 + a32 * b22 + a33 * b32,
+        a30 * b03 + a31 * b13 + a32 * b23 + a33 * b33
+      ]
+    ])
+
+  @staticmethod
+  def _sub_determinants_4x4(rows: tuple) -> tuple[tuple, tuple]:
+    """
+    2x2 determinants of the top two rows (s) and bottom two rows (c),
+    every 4x4 minor is a sum of products of these
+    """
+    (a00, a01, a02, a03), (a10, a11, a12, a13), (a20, a21, a22, a23), (a30, a31, a32, a33) = rows
+    s = (
+      a00 * a11 - a10 * a01,
+      a00 * a12 - a10 * a02,
+      a00 * a13 - a10 * a03,
+      a01 * a12 - a11 * a02,
+      a01 * a13 - a11 * a03,
+      a02 * a13 - a12 * a03)
+    c = (
+      a20 * a31 - a30 * a21,
+      a20 * a32 - a30 * a22,
+      a20 * a33 - a30 * a23,
+      a21 * a32 - a31 * a22,
+      a21 * a33 - a31 * a23,
+      a22 * a33 - a32 * a23)
+    return s, c
+
+  @staticmethod
+  def _inverse_4x4(rows: tuple, determinant: float) -> Matrix:
+    """ closed form 4x4 inverse, the transposed cofactors over the determinant """
+    (a00, a01, a02, a03), (a10, a11, a12, a13), (a20, a21, a22, a23), (a30, a31, a32, a33) = rows
+    (s0, s1, s2, s3, s4, s5), (c0, c1, c2, c3, c4, c5) = Matrix._sub_determinants_4x4(rows)
+    return Matrix([
+      [
+        (a11 * c5 - a12 * c4 + a13 * c3) / determinant,
+        (-a01 * c5 + a02 * c4 - a03 * c3) / determinant,
+        (a31 * s5 - a32 * s4 + a33 * s3) / determinant,
+        (-a21 * s5 + a22 * s4 - a23 * s3) / determinant
+      ],
+      [
+        (-a10 * c5 + a12 * c2 - a13 * c1) / determinant,
+        (a00 * c5 - a02 * c2 + a03 * c1) / determinant,
+        (-a30 * s5 + a32 * s2 - a33 * s1) / determinant,
+        (a20 * s5 - a22 * s2 + a23 * s1) / determinant
+      ],
+      [
+        (a10 * c4 - a11 * c2 + a13 * c0) / determinant,
+        (-a00 * c4 + a01 * c2 - a03 * c0) / determinant,
+        (a30 * s4 - a31 * s2 + a33 * s0) / determinant,
+        (-a20 * s4 + a21 * s2 - a23 * s0) / determinant
+      ],
+      [
+        (-a10 * c3 + a11 * c1 - a12 * c0) / determinant,
+        (a00 * c3 - a01 * c1 + a02 * c0) / determinant,
+        (-a30 * s3 + a31 * s1 - a32 * s0) / determinant,
+        (a20 * s3 - a21 * s1 + a22 * s0) / determinant
+      ]
+    ])
 
   @classmethod
   def identity(cls):
     """ Helper to return the identity matrix """
+    # seed the cached inverse so fluent chains starting here carry theirs along
     return Matrix([
       [1,0,0,0],
       [0,1,0,0],
       [0,0,1,0],
       [0,0,0,1]
-    ])
+    ], Matrix([
+      [1,0,0,0],
+      [0,1,0,0],
+      [0,0,1,0],
+      [0,0,0,1]
+    ]))
 
   @classmethod
   def translation(cls, x: float, y: float, z: float) -> Matrix:
@@ -244,3 +337,45 @@ class Matrix:
       [z_x,z_y,1,0],
       [0,0,0,1]
     ])
+
+  def translate(self, x: float, y: float, z: float) -> Matrix:
+    """ Chain a translation after this transform """
+    return self._then(Matrix.translation(x, y, z), Matrix.translation(-x, -y, -z))
+
+  def scale(self, x: float, y: float, z: float) -> Matrix:
+    """ Chain a scaling after this transform """
+    inverse = None
+    if x != 0 and y != 0 and z != 0:
+      inverse = Matrix.scaling(1 / x, 1 / y, 1 / z)
+    return self._then(Matrix.scaling(x, y, z), inverse)
+
+  def rotate_x(self, radians: float) -> Matrix:
+    """ Chain an X rotation after this transform """
+    return self._then(Matrix.rotation_x(radians), Matrix.rotation_x(-radians))
+
+  def rotate_y(self, radians: float) -> Matrix:
+    """ Chain a Y rotation after this transform """
+    return self._then(Matrix.rotation_y(radians), Matrix.rotation_y(-radians))
+
+  def rotate_z(self, radians: float) -> Matrix:
+    """ Chain a Z rotation after this transform """
+    return self._then(Matrix.rotation_z(radians), Matrix.rotation_z(-radians))
+
+  def shear(self, x_y, x_z, y_x, y_z, z_x, z_y) -> Matrix:
+    """ Chain a shearing after this transform """
+    transform = Matrix.shearing(x_y, x_z, y_x, y_z, z_x, z_y)
+    inverse = None
+    if transform.determinant != 0:
+      inverse = transform.inverse
+    return self._then(transform, inverse)
+
+  def _then(self, transform: Matrix, inverse: Matrix|None) -> Matrix:
+    """
+    apply transform after this one, so Matrix.identity().rotate_y(a).translate(x, y, z)
+    is translation * rotation. when this matrix already has its inverse the
+    result's inverse is built alongside instead of being solved for later
+    """
+    matrix = transform * self
+    if inverse is None or self._inverse is None:
+      return matrix
+    return Matrix(matrix.rows, self._inverse * inverse)
@@ -29,6 +29,12 @@ class Pattern(metaclass=abc.ABCMeta):
   def pattern_at(self, p: Point) -> Colour:
     """ get the colour at a point """
 
+  def colour_bound(self) -> float:
+    """ largest channel of any colour the pattern gives, unknown unless it blends colours a and b """
+    if hasattr(self, "a") and hasattr(self, "b"):
+      return max(self.a.max_channel(), self.b.max_channel())
+    return math.inf
+
 class UnitTestPattern(Pattern):
   """ pattern for unit tests """
   def __init__(self) -> Stripe:
@@ -51,6 +57,7 @@ class Stripe(Pattern):
     value = math.floor(p.x) % 2 == 0
     return self.a if value else self.b
 
+
 class Gradient(Pattern):
   """ Gradient """
   def __init__(self, a: Colour, b: Colour) -> Gradient:
@@ -64,6 +71,7 @@ class Gradient(Pattern):
     fraction = p.x - math.floor(p.x)
     return self.a + distance * fraction
 
+
 class Ring(Pattern):
   """ Ring """
   def __init__(self, a: Colour, b: Colour) -> Gradient:
@@ -78,6 +86,7 @@ class Ring(Pattern):
       return self.a
     return self.b
 
+
 class Checker(Pattern):
   """ Checker """
   def __init__(self, a: Colour, b: Colour, uv_map = False) -> Gradient:
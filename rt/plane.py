@@ -3,8 +3,11 @@ Plane module
 """
 from __future__ import annotations
 
+import math
+from typing import Sequence
+
+from rt.bounds import BoundingBox
 from rt.helpers import EPSILON
-from rt.intersection import Intersection, Intersections
 from rt.ray import Ray
 from rt.shape import Shape
 from rt.tuple import Point, Vector
@@ -15,15 +18,34 @@ class Plane(Shape):
   Plane
   """
 
+  def local_bounds(self) -> BoundingBox:
+    return BoundingBox(Point(-math.inf, 0, -math.inf), Point(math.inf, 0, math.inf))
+
   def local_normal_at(self, local_point: Point) -> Vector:
     return Vector(0, 1, 0)
 
-  def intersect(self, ray: Ray) -> Intersections:
-    """ Compute intersections with ray """
-    local_ray = super().intersect(ray)
-
+  def local_intersect(self, local_ray: Ray) -> tuple[float, ...]:
+    """ t value where a ray in object space crosses the plane """
     if abs(local_ray.direction.y) < EPSILON:
-      return Intersections()
+      return ()
 
     t = -local_ray.origin.y / local_ray.direction.y
-    return Intersections(Intersection(t, self))
+    return (t,)
+
+  def local_intersect_many(
+    self,
+    origins: Sequence[Sequence[float]],
+    directions: Sequence[Sequence[float]]) -> tuple[list[float], list[float], list[bool]]:
+    """ batch intersect rays already in object space """
+    near = []
+    hits = []
+    for (_, oy, _, _), (_, dy, _, _) in zip(origins, directions):
+      if abs(dy) < EPSILON:
+        near.append(math.inf)
+        hits.append(False)
+      else:
+        near.append(-oy / dy)
+        hits.append(True)
+
+    # a plane is crossed once, so the near and far t are the same
+    return near, list(near), hits
@@ -0,0 +1,92 @@
+"""
+PNG module
+"""
+from __future__ import annotations
+
+import binascii
+import zlib
+from typing import BinaryIO
+
+PNG_SIGNATURE = b"\x89\x50\x4E\x47\x0D\x0A\x1A\x0A"
+
+def write_chunk(output_stream: BinaryIO, chunk_type: str, chunk_data: bytes) -> None:
+  """ write a length, type, data and crc chunk """
+  chunk_data_length = len(chunk_data)
+  output_stream.write(chunk_data_length.to_bytes(4, "big"))
+
+  chunk_type_bytes = bytes(chunk_type, "ascii")
+  output_stream.write(chunk_type_bytes)
+  output_stream.write(chunk_data)
+
+  crc = binascii.crc32(chunk_type_bytes)
+  crc = binascii.crc32(chunk_data, crc)
+  output_stream.write(crc.to_bytes(4, "big"))
+
+def write_header(output_stream: BinaryIO, width: int, height: int) -> None:
+  """ write the PNG signature and the IHDR chunk of an 8 bit RGB image """
+  output_stream.write(PNG_SIGNATURE)
+
+  ihdr_data = bytearray() # (13 data bytes total)
+  ihdr_data.extend(width.to_bytes(4, "big")) # width (4 bytes)
+  ihdr_data.extend(height.to_bytes(4, "big")) # height (4 bytes)
+  ihdr_data.extend((8).to_bytes(1, "big")) # bit depth (1 byte, values 1, 2, 4, 8, or 16)
+  ihdr_data.extend((2).to_bytes(1, "big")) # 2 (010) red, green and blue: rgb/truecolor
+  ihdr_data.extend((0).to_bytes(1, "big")) # compression method (1 byte, value 0)
+  ihdr_data.extend((0).to_bytes(1, "big")) # filter method (1 byte, value 0)
+  ihdr_data.extend((0).to_bytes(1, "big")) # interlace method (1 byte, values 0 "no interlace" or 1 "Adam7 interlace")
+  write_chunk(output_stream, "IHDR", bytes(ihdr_data))
+
+class PNGWriter:
+  """
+  PNGWriter encodes an image a scanline at a time
+
+  rows go through one zlib compressobj and whatever it produces is written
+  out as an IDAT chunk straight away, so only the compressor state and the
+  current row are held in memory. every flush_rows rows the compressor is
+  sync flushed and the stream flushed, so a partly rendered image already
+  decodes up to its last flushed row.
+  """
+  def __init__(self, output_stream: BinaryIO, width: int, height: int, flush_rows: int = 16) -> None:
+    self.output_stream = output_stream
+    self.width = width
+    self.height = height
+    self.flush_rows = flush_rows
+    self.rows_written = 0
+    self._compressor = zlib.compressobj()
+    write_header(output_stream, width, height)
+
+  def __enter__(self) -> PNGWriter:
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback) -> None:
+    if exc_type is None:
+      self.close()
+
+  def write_row(self, row: bytes) -> None:
+    """ write the next scanline, given as width * 3 RGB bytes """
+    if self.rows_written == self.height:
+      raise ValueError(f"PNG already has all {self.height} rows")
+    if len(row) != self.width * 3:
+      raise ValueError(f"PNG row must be {self.width * 3} bytes, got {len(row)}")
+
+    # filter method 0 byte to start each scanline
+    self._write_idat(self._compressor.compress(b"\x00"))
+    self._write_idat(self._compressor.compress(row))
+    self.rows_written += 1
+
+    if self.flush_rows and self.rows_written % self.flush_rows == 0 and self.rows_written < self.height:
+      self._write_idat(self._compressor.flush(zlib.Z_SYNC_FLUSH))
+      if hasattr(self.output_stream, "flush"):
+        self.output_stream.flush()
+
+  def close(self) -> None:
+    """ finish the compressed data and write IEND """
+    if self.rows_written != self.height:
+      raise ValueError(f"PNG has {self.rows_written} of {self.height} rows")
+    self._write_idat(self._compressor.flush())
+    write_chunk(self.output_stream, "IEND", bytes())
+
+  def _write_idat(self, data: bytes) -> None:
+    """ write compressed data as an IDAT chunk, skipping empty output """
+    if len(data) > 0:
+      write_chunk(self.output_stream, "IDAT", data)
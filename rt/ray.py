@@ -17,7 +17,7 @@ class Ray:
 
   def position(self, distance: float) -> Point:
     """ Compute point some distance along ray """
-    return self.origin + self.direction * distance
+    return self.origin.multiply_add(self.direction, distance)
 
   def transform(self, transform: Matrix) -> Ray:
     """ Transform the ray """
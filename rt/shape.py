@@ -4,8 +4,12 @@ Shape module
 from __future__ import annotations
 
 import abc
-from typing import TYPE_CHECKING
+import math
+import weakref
+from typing import TYPE_CHECKING, Sequence
 
+from rt.bounds import BoundingBox
+from rt.intersection import Intersection, Intersections
 from rt.material import Material
 from rt.matrix import Matrix
 from rt.tuple import Point, Vector
@@ -14,7 +18,12 @@ if TYPE_CHECKING:
   from rt.ray import Ray
 
 class Shape(metaclass=abc.ABCMeta):
-  """ base class for shapes """
+  """
+  base class for shapes
+
+  shapes compare and hash by identity so the renderer can keep them in
+  sets and dicts, equals compares their transform and material
+  """
   def __init__(
     self,
     transform: Matrix = None,
@@ -23,15 +32,91 @@ class Shape(metaclass=abc.ABCMeta):
       transform = Matrix.identity()
     if material is None:
       material = Material()
+    # lists holding the shape, their version is bumped when it moves
+    self._owners: list[weakref.ref] = []
+    self._local_bounds: BoundingBox = None
+    self._bounds: BoundingBox = None
     self.transform = transform
     self.material = material
 
-  def __eq__(self, o: Shape) -> bool:
+  def equals(self, o: Shape) -> bool:
+    """ true when both shapes have the same transform and material """
     return self.transform == o.transform and self.material == o.material
 
-  def intersect(self, ray: Ray):
-    """ base class intersect """
-    return ray.transform(self.transform.inverse)
+  @property
+  def transform(self) -> Matrix:
+    """ object to world transform """
+    return self._transform
+
+  @transform.setter
+  def transform(self, transform: Matrix) -> None:
+    self._transform = transform
+    self._bounds = None
+    for owner in self._owners:
+      shapes = owner()
+      if shapes is not None:
+        shapes.version += 1
+
+  def __getstate__(self) -> dict:
+    state = self.__dict__.copy()
+    # owners are not carried over, the lists holding a copy add themselves
+    state["_owners"] = []
+    return state
+
+  def add_owner(self, shapes: list) -> None:
+    """ bump the version of a list holding the shape when the shape moves """
+    self._owners = [owner for owner in self._owners if owner() is not None]
+    if not any(owner() is shapes for owner in self._owners):
+      self._owners.append(weakref.ref(shapes))
+
+  def local_bounds(self) -> BoundingBox:
+    """ object space bounds, unbounded unless a shape knows better """
+    return BoundingBox(
+      Point(-math.inf, -math.inf, -math.inf),
+      Point(math.inf, math.inf, math.inf))
+
+  def bounds(self) -> BoundingBox:
+    """ world space bounds, cached until the transform changes """
+    if self._bounds is None:
+      if self._local_bounds is None:
+        self._local_bounds = self.local_bounds()
+      self._bounds = self._local_bounds.transform(self.transform)
+    return self._bounds
+
+  def intersect(self, ray: Ray) -> Intersections:
+    """ Compute intersections with ray """
+    local_ray = ray.transform(self.transform.inverse)
+    return Intersections(*[Intersection(t, self) for t in self.local_intersect(local_ray)])
+
+  def occludes(self, ray: Ray, distance: float) -> bool:
+    """ true when the ray crosses the shape within [0, distance) """
+    local_ray = ray.transform(self.transform.inverse)
+    for t in self.local_intersect(local_ray):
+      if 0 <= t < distance:
+        return True
+    return False
+
+  @abc.abstractmethod
+  def local_intersect(self, local_ray: Ray) -> tuple[float, ...]:
+    """ t values where a ray in object space crosses the shape """
+
+  def intersect_many(
+    self,
+    origins: Sequence[Sequence[float]],
+    directions: Sequence[Sequence[float]]) -> tuple[list[float], list[float], list[bool]]:
+    """
+    intersect a batch of rays given as (x, y, z, w) origins and directions,
+    returns the near and far t of every ray and whether it hit the shape
+    """
+    inverse = self.transform.inverse
+    return self.local_intersect_many(inverse.transform_many(origins), inverse.transform_many(directions))
+
+  @abc.abstractmethod
+  def local_intersect_many(
+    self,
+    origins: Sequence[Sequence[float]],
+    directions: Sequence[Sequence[float]]) -> tuple[list[float], list[float], list[bool]]:
+    """ batch intersect rays already in object space """
 
   def normal_at(self, world_point: Point) -> Vector:
     """ return normal at a point """
@@ -49,14 +134,20 @@ class UnitTestShape(Shape):
   """ shape for unit tests """
   def __init__(self):
     self.saved_ray = None
+    self.saved_rays = None
     super().__init__()
 
   def local_normal_at(self, local_point) -> Vector:
     """ override for normal_at """
     return Vector(local_point.x, local_point.y, local_point.z)
 
-  def intersect(self, ray: Ray):
-    """ Compute intersections of ray with sphere """
-    saved_ray = super().intersect(ray)
-    self.saved_ray = saved_ray
+  def local_intersect(self, local_ray: Ray) -> tuple[float, ...]:
+    """ save the object space ray """
+    self.saved_ray = local_ray
+    return ()
+
+  def local_intersect_many(self, origins, directions):
+    """ save the object space batch """
+    self.saved_rays = (origins, directions)
+    return [], [], []
   
\ No newline at end of file
@@ -4,8 +4,9 @@ Sphere module
 from __future__ import annotations
 
 import math
+from typing import Sequence
 
-from rt.intersection import Intersection, Intersections
+from rt.bounds import BoundingBox
 from rt.ray import Ray
 from rt.shape import Shape
 from rt.tuple import Point, Vector
@@ -15,10 +16,8 @@ class Sphere(Shape):
   """
   Sphere
   """
-  def intersect(self, ray: Ray) -> Intersections:
-    """ Compute intersections with ray """
-    local_ray = super().intersect(ray)
-
+  def local_intersect(self, local_ray: Ray) -> tuple[float, ...]:
+    """ t values where a ray in object space crosses the sphere """
     sphere_to_ray = local_ray.origin - Point(0, 0, 0)
 
     a = local_ray.direction.dot(local_ray.direction)
@@ -28,15 +27,43 @@ class Sphere(Shape):
     discriminant = b**2 - 4 * a * c
 
     if discriminant < 0:
-      return Intersections()
+      return ()
 
     t1 = (-b - math.sqrt(discriminant)) / (2 * a)
     t2 = (-b + math.sqrt(discriminant)) / (2 * a)
 
-    return Intersections(
-      Intersection(t1, self),
-      Intersection(t2, self)
-    )
+    return (t1, t2)
+
+  def local_intersect_many(
+    self,
+    origins: Sequence[Sequence[float]],
+    directions: Sequence[Sequence[float]]) -> tuple[list[float], list[float], list[bool]]:
+    """ batch intersect rays already in object space """
+    near = []
+    far = []
+    hits = []
+    for (ox, oy, oz, _), (dx, dy, dz, _) in zip(origins, directions):
+      a = dx * dx + dy * dy + dz * dz
+      b = 2 * (dx * ox + dy * oy + dz * oz)
+      c = ox * ox + oy * oy + oz * oz - 1
+
+      discriminant = b**2 - 4 * a * c
+
+      if discriminant < 0:
+        near.append(math.inf)
+        far.append(math.inf)
+        hits.append(False)
+        continue
+
+      root = math.sqrt(discriminant)
+      near.append((-b - root) / (2 * a))
+      far.append((-b + root) / (2 * a))
+      hits.append(True)
+
+    return near, far, hits
+
+  def local_bounds(self) -> BoundingBox:
+    return BoundingBox(Point(-1, -1, -1), Point(1, 1, 1))
 
   def local_normal_at(self, local_point: Point) -> Vector:
     return local_point - Point(0, 0, 0)
@@ -11,6 +11,9 @@ from rt.helpers import EPSILON
 class Tuple:
   """
   Tuple holds x y z w for points and vectors.
+
+  the in place operators and the _into helpers overwrite a tuple, only
+  use them on tuples the caller has just created and nothing else shares
   """
   __slots__ = 'x', 'y', 'z', 'w'
   def __init__(self, x: float, y: float, z: float, w: float) -> None:
@@ -64,9 +67,54 @@ class Tuple:
   def __neg__(self):
     return Tuple(-self.x, -self.y, -self.z, -self.w)
 
+  def __iadd__(self, other: Tuple):
+    self.x += other.x
+    self.y += other.y
+    self.z += other.z
+    self.w += other.w
+    return self
+
+  def __isub__(self, other: Tuple):
+    self.x -= other.x
+    self.y -= other.y
+    self.z -= other.z
+    self.w -= other.w
+    return self
+
+  def __imul__(self, other: int|float):
+    self.x *= other
+    self.y *= other
+    self.z *= other
+    self.w *= other
+    return self
+
+  def __itruediv__(self, other: int|float):
+    self.x /= other
+    self.y /= other
+    self.z /= other
+    self.w /= other
+    return self
+
+  def multiply_add(self, other: Tuple, scalar: float) -> Tuple:
+    """ self + other * scalar without the intermediate tuple """
+    return Tuple(
+      self.x + other.x * scalar,
+      self.y + other.y * scalar,
+      self.z + other.z * scalar,
+      self.w + other.w * scalar)
+
   def reflect(self, normal: Tuple) -> Tuple:
     """ return the vector refleced off the normal """
-    return self - normal * 2 * self.dot(normal)
+    return self.reflect_into(normal, Tuple(0, 0, 0, 0))
+
+  def reflect_into(self, normal: Tuple, out: Tuple) -> Tuple:
+    """ write the vector reflected off the normal into out, which may be self """
+    d = self.dot(normal)
+    out.x = self.x - normal.x * 2 * d
+    out.y = self.y - normal.y * 2 * d
+    out.z = self.z - normal.z * 2 * d
+    out.w = self.w - normal.w * 2 * d
+    return out
 
   def dot(self, tuple_b: Tuple) -> float:
     """ Helper to compute the dot product """
@@ -93,8 +141,12 @@ class Tuple:
 
 class Point(Tuple):
   """ Point specialization of Tuple """
-  def __init__(self, x: float, y: float, z: float) -> None:
-    super().__init__(x, y, z, 1)
+  __slots__ = ()
+  def __init__(self, x: float, y: float, z: float) -> None: # pylint: disable=super-init-not-called
+    self.x = x
+    self.y = y
+    self.z = z
+    self.w = 1
 
   # def view_transform(self, to: Point, up: Vector) -> rt.matrix.Matrix:
   #   """ compute the view transform """
@@ -112,5 +164,9 @@ class Point(Tuple):
 
 class Vector(Tuple):
   """ Vector specialization of Tuple """
-  def __init__(self, x: float, y: float, z: float) -> None:
-    super().__init__(x, y, z, 0)
+  __slots__ = ()
+  def __init__(self, x: float, y: float, z: float) -> None: # pylint: disable=super-init-not-called
+    self.x = x
+    self.y = y
+    self.z = z
+    self.w = 0
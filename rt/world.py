@@ -3,8 +3,11 @@ World module
 """
 from __future__ import annotations
 
+import hashlib
+import json
 import math
 
+from rt.bvh import BVH
 from rt.colour import Colour
 from rt.intersection import Comps, Intersection, Intersections
 from rt.light import PointLight
@@ -13,27 +16,155 @@ from rt.matrix import Matrix
 from rt.ray import Ray
 from rt.shape import Shape
 from rt.sphere import Sphere
-from rt.tuple import Point
-
+from rt.tuple import Point, Tuple
+
+
+# per shape caches and bookkeeping that do not change what a scene renders
+DIGEST_IGNORED = ("_owners", "_bounds", "_local_bounds")
+
+def describe(value: object) -> object:
+  """ JSON friendly description of a scene value, used for digests """
+  if value is None or isinstance(value, (bool, int, float, str)):
+    return value
+  if isinstance(value, Matrix):
+    return [list(row) for row in value.rows]
+  if isinstance(value, Tuple):
+    return [value.x, value.y, value.z, value.w]
+  if isinstance(value, Colour):
+    return [value.red, value.green, value.blue]
+  if isinstance(value, (list, tuple)):
+    return [describe(item) for item in value]
+  description = {"type": type(value).__name__}
+  for key, item in vars(value).items():
+    if key not in DIGEST_IGNORED:
+      description[key] = describe(item)
+  return description
+
+class ShapeList(list):
+  """
+  list of shapes that counts its changes, and those of its shapes'
+  transforms, so the world knows when to rebuild its BVH
+  """
+  def __init__(self, shapes=()) -> ShapeList:
+    super().__init__(shapes)
+    self.version = 0
+    self._own(self)
+
+  def __reduce__(self):
+    # rebuild through __init__, unpickling would otherwise append the items
+    # before the version attribute is restored
+    return (ShapeList, (list(self),))
+
+  def _own(self, shapes) -> None:
+    """ have shapes added to the list report their transform changes """
+    for shape in shapes:
+      shape.add_owner(self)
+
+  def __setitem__(self, key, value) -> None:
+    self.version += 1
+    super().__setitem__(key, value)
+    self._own(value if isinstance(key, slice) else [value])
+
+  def __delitem__(self, key) -> None:
+    self.version += 1
+    super().__delitem__(key)
+
+  def __iadd__(self, shapes) -> ShapeList:
+    self.version += 1
+    shapes = list(shapes)
+    self._own(shapes)
+    return super().__iadd__(shapes)
+
+  def append(self, shape: Shape) -> None:
+    self.version += 1
+    shape.add_owner(self)
+    super().append(shape)
+
+  def extend(self, shapes) -> None:
+    self.version += 1
+    shapes = list(shapes)
+    self._own(shapes)
+    super().extend(shapes)
+
+  def insert(self, index: int, shape: Shape) -> None:
+    self.version += 1
+    shape.add_owner(self)
+    super().insert(index, shape)
+
+  def remove(self, shape: Shape) -> None:
+    self.version += 1
+    super().remove(shape)
+
+  def pop(self, index: int = -1) -> Shape:
+    self.version += 1
+    return super().pop(index)
+
+  def clear(self) -> None:
+    self.version += 1
+    super().clear()
 
 class World:
   """
   World
+
+  a light is culled at a hit, skipping its shadow ray and lighting, when
+  the most it could add to any channel is at most light_cull_epsilon.
+  culled_light_evaluations counts the lights culled this way.
   """
   def __init__(self) -> World:
-    self.objects: list[Shape] = []
+    self.objects: ShapeList = ShapeList()
     self.lights: list[PointLight] = []
+    self.light_cull_epsilon = 0.0
+    self.culled_light_evaluations = 0
+    self._bvh: BVH = None
+    self._bvh_version = None
+
+  @property
+  def objects(self) -> ShapeList:
+    """
+    shapes in the world, assigning a list takes a snapshot of it so later
+    changes must be made through world.objects
+    """
+    return self._objects
+
+  @objects.setter
+  def objects(self, shapes: list[Shape]) -> None:
+    self._objects = ShapeList(shapes)
+
+  @property
+  def bvh(self) -> BVH:
+    """ BVH over the objects, rebuilt when objects or their transforms change """
+    version = (id(self._objects), self._objects.version)
+    if self._bvh is None or self._bvh_version != version:
+      self._bvh = BVH(self._objects)
+      self._bvh_version = version
+    return self._bvh
+
+  def digest(self) -> str:
+    """
+    sha256 of the objects, lights and light culling, the same for the same
+    scene built in any process, so saved render progress can be matched to
+    its scene
+    """
+    scene = {
+      "objects": describe(list(self.objects)),
+      "lights": describe(self.lights),
+      "light_cull_epsilon": self.light_cull_epsilon,
+    }
+    return hashlib.sha256(json.dumps(scene, sort_keys=True).encode("utf-8")).hexdigest()
 
   def intersect(self, ray: Ray) -> Intersections:
     """ Intersect a ray with the world """
-    intersections = Intersections()
-    for o in self.objects:
-      intersections.xs.extend(o.intersect(ray).xs)
-
+    intersections = Intersections(ordered=True)
+    intersections.xs = self.bvh.intersect(ray)
     intersections.xs.sort(key=lambda i: i.t)
 
     return intersections
 
+  def closest_hit(self, ray: Ray) -> Intersection|None:
+    """ the hit of a ray with the world, without the other intersections """
+    return self.bvh.closest(ray)
+
   def refracted_colour(self, comps: Comps, remaining: int = 5) -> Colour:
     """ return the refracted colour """
 
@@ -100,14 +231,7 @@ class World:
 
   def shade_hit(self, comps: Comps, remaining: int = 5) -> Colour:
     """ shade function. get colour from all the lights """
-    shadowed = self.is_shadowed(comps.over_point)
-    surface = comps.object.material.lighting(
-      comps.object,
-      self.lights[0],
-      comps.over_point,
-      comps.eyev,
-      comps.normalv,
-      shadowed)
+    surface = self.surface_colour(comps)
 
     reflected = self.reflected_colour(comps, remaining)
     refracted = self.refracted_colour(comps, remaining)
@@ -116,33 +240,72 @@ class World:
     material = comps.object.material
     if material.reflective > 0 and material.transparency > 0:
       reflectance = comps.schlick()
-      return surface + reflected * reflectance + refracted * (1 - reflectance)
+      reflected *= reflectance
+      refracted *= 1 - reflectance
 
-    return surface + reflected + refracted
+    # the colours are all fresh, so they are summed in place
+    surface += reflected
+    surface += refracted
+    return surface
 
 
+  def surface_colour(self, comps: Comps) -> Colour:
+    """ lighting summed over every light, skipping culled lights and shadow rays for lights behind the surface """
+    surface = None
+    point = comps.over_point
+    normalv = comps.normalv
+    material = comps.object.material
+    bound = material.contribution_bound()
+    for light in self.lights:
+      if light.intensity.max_channel() * bound <= self.light_cull_epsilon:
+        self.culled_light_evaluations += 1
+        continue
+
+      to_light = light.position - point
+      if to_light.dot(normalv) < 0:
+        shadowed = True
+      else:
+        shadowed = self.is_shadowed(point, light)
+
+      colour = material.lighting(comps.object, light, point, comps.eyev, normalv, shadowed)
+      if surface is None:
+        surface = colour
+      else:
+        surface += colour
+
+    if surface is None:
+      return Colour(0, 0, 0)
+    return surface
+
   def colour_at(self, ray: Ray, remaining: int = 5) -> Colour:
     """ get colour from ray at world intersection """
-    xs = self.intersect(ray)
-    hit: Intersection = xs.hit()
+    hit = self.closest_hit(ray)
     if hit is None:
       return Colour(0, 0, 0)
+
+    # n1 and n2 only matter for transparent surfaces, and only those need
+    # every intersection along the ray to track the refractive containers
+    xs = None
+    if hit.object.material.transparency > 0:
+      xs = self.intersect(ray)
+      hit = xs.hit()
     comps = hit.prepare_computations(ray, xs)
     return self.shade_hit(comps, remaining)
 
-  def is_shadowed(self, p: Point) -> bool:
-    """ is the point in shadow """
-    v = self.lights[0].position - p
+  def is_shadowed(self, p: Point, light: PointLight = None) -> bool:
+    """ is the point in shadow from the light, the first light by default """
+    if light is None:
+      light = self.lights[0]
+    return self.occluded(p, light.position)
+
+  def occluded(self, point: Point, light_position: Point) -> bool:
+    """ is anything between the point and the light """
+    v = light_position - point
     distance = v.magnitude()
     direction = v.normalize()
 
-    r = Ray(p, direction)
-    intersections = self.intersect(r)
-
-    h = intersections.hit()
-    if h is not None and h.t < distance:
-      return True
-    return False
+    r = Ray(point, direction)
+    return self.bvh.occluded(r, distance)
 
   @classmethod
   def DefaultWorld(cls) -> World:
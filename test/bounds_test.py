@@ -0,0 +1,85 @@
+""" Bounds Tests """
+import math
+
+from rt.bounds import BoundingBox
+from rt.cube import Cube
+from rt.cylinder import Cylinder
+from rt.helpers import EPSILON
+from rt.matrix import Matrix
+from rt.plane import Plane
+from rt.sphere import Sphere
+from rt.tuple import Point
+
+
+class TestBounds:
+  """ bounding boxes """
+
+  def test_empty_box(self):
+    """ Creating an empty bounding box """
+    box = BoundingBox()
+    assert box.minimum == Point(math.inf, math.inf, math.inf)
+    assert box.maximum == Point(-math.inf, -math.inf, -math.inf)
+
+  def test_add_points(self):
+    """ Adding points to an empty bounding box """
+    box = BoundingBox()
+    box.add_point(Point(-5, 2, 0))
+    box.add_point(Point(7, 0, -3))
+    assert box.minimum == Point(-5, 0, -3)
+    assert box.maximum == Point(7, 2, 0)
+
+  def test_shape_bounds(self):
+    """ Each shape has a bounding box in object space """
+    assert Sphere().local_bounds() == BoundingBox(Point(-1, -1, -1), Point(1, 1, 1))
+    assert Cube().local_bounds() == BoundingBox(Point(-1, -1, -1), Point(1, 1, 1))
+    assert Plane().local_bounds() == BoundingBox(Point(-math.inf, 0, -math.inf), Point(math.inf, 0, math.inf))
+    assert Cylinder().local_bounds() == BoundingBox(Point(-1, -math.inf, -1), Point(1, math.inf, 1))
+
+  def test_transform_box(self):
+    """ Transforming a bounding box """
+    box = BoundingBox(Point(-1, -1, -1), Point(1, 1, 1))
+    matrix = Matrix.rotation_x(math.pi / 4) * Matrix.rotation_y(math.pi / 4)
+    transformed = box.transform(matrix)
+    # transformed boxes are padded by EPSILON to stay conservative
+    assert transformed.minimum == Point(-1.41421 - EPSILON, -1.70711 - EPSILON, -1.70711 - EPSILON)
+    assert transformed.maximum == Point(1.41421 + EPSILON, 1.70711 + EPSILON, 1.70711 + EPSILON)
+
+  def test_transform_infinite_box(self):
+    """ Transforming an infinite bounding box keeps it infinite """
+    s = Plane()
+    s.transform = Matrix.translation(0, -1, 0)
+    box = s.bounds()
+    assert box.minimum.x == -math.inf
+    assert box.maximum.z == math.inf
+    assert math.isclose(box.minimum.y, -1, abs_tol=0.001)
+    assert math.isclose(box.maximum.y, -1, abs_tol=0.001)
+    assert box.is_finite() is False
+
+  def test_intersect_box(self):
+    """ Intersecting a ray line with a bounding box """
+    box = BoundingBox(Point(5, -2, 0), Point(11, 4, 7))
+    tests = [
+      (Point(15, 1, 2), (-1, 0, 0), True),
+      (Point(-5, -1, 4), (1, 0, 0), True),
+      (Point(7, 6, 5), (0, -1, 0), True),
+      (Point(9, -5, 6), (0, 1, 0), True),
+      (Point(8, 2, 12), (0, 0, -1), True),
+      (Point(6, 0, -5), (0, 0, 1), True),
+      (Point(8, 1, 3.5), (0, 0, 1), True),
+      (Point(9, -1, -8), (2, 4, 6), False),
+      (Point(8, 3, -4), (6, 2, 4), False),
+      (Point(9, -1, -2), (4, 6, 2), False),
+      (Point(4, 0, 9), (0, 0, -1), False),
+      (Point(8, 6, -1), (0, -1, 0), False),
+      (Point(12, 5, 4), (-1, 0, 0), False)
+    ]
+    for origin, direction, result in tests:
+      assert box.intersects(origin.x, origin.y, origin.z, *direction) is result
+
+  def test_intersect_box_segment(self):
+    """ Intersecting a segment of a ray with a bounding box """
+    box = BoundingBox(Point(-1, -1, -1), Point(1, 1, 1))
+    assert box.intersects(0, 0, -5, 0, 0, 1) is True
+    assert box.intersects(0, 0, -5, 0, 0, 1, 0, 3) is False
+    assert box.intersects(0, 0, -5, 0, 0, 1, 0, 4.5) is True
+    assert box.intersects(0, 0, 5, 0, 0, 1, 0, 10) is False
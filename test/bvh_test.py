@@ -0,0 +1,87 @@
+""" BVH Tests """
+import math
+
+from rt.bvh import BVH
+from rt.cube import Cube
+from rt.cylinder import Cylinder
+from rt.intersection import Intersections
+from rt.matrix import Matrix
+from rt.plane import Plane
+from rt.ray import Ray
+from rt.sphere import Sphere
+from rt.tuple import Point, Vector
+
+
+class TestBVH:
+  """ bounding volume hierarchy """
+
+  def test_unbounded_shapes(self):
+    """ Shapes with infinite bounds are kept out of the tree """
+    p = Plane()
+    s = Sphere()
+    bvh = BVH([p, s])
+    assert bvh.unbounded == [p]
+    assert bvh.root.shapes == [s]
+
+  def test_bvh_intersections(self):
+    """ The BVH finds the same intersections as testing every shape """
+    shapes = [Plane()]
+    for i in range(0, 24):
+      c = Cube() if i % 2 else Sphere()
+      c.transform = Matrix.identity().scale(0.5, 0.5, 0.5).translate(4, 0, 0).rotate_y((math.pi / 12) * i)
+      shapes.append(c)
+    bvh = BVH(shapes)
+
+    for i in range(0, 32):
+      angle = (math.pi / 16) * i
+      r = Ray(Point(0, 0.25, 0), Vector(math.cos(angle), -0.05, math.sin(angle)))
+      expected = []
+      for shape in shapes:
+        expected.extend(shape.intersect(r).xs)
+      xs = bvh.intersect(r)
+      assert sorted((x.t, id(x.object)) for x in xs) == sorted((x.t, id(x.object)) for x in expected)
+
+  def test_bvh_closest(self):
+    """ The closest hit matches the hit of every intersection """
+    shapes = [Plane()]
+    for i in range(0, 24):
+      c = Cube() if i % 2 else Sphere()
+      c.transform = Matrix.identity().scale(0.5, 0.5, 0.5).translate(4, 0, 0).rotate_y((math.pi / 12) * i)
+      shapes.append(c)
+    bvh = BVH(shapes)
+
+    for i in range(0, 32):
+      angle = (math.pi / 16) * i
+      r = Ray(Point(0, 0.25, 0), Vector(math.cos(angle), -0.05, math.sin(angle)))
+      expected = Intersections(*bvh.intersect(r)).hit()
+      hit = bvh.closest(r)
+      assert hit.t == expected.t
+      assert hit.object is expected.object
+
+  def test_bvh_closest_miss(self):
+    """ The closest hit is None when nothing is in front of the ray """
+    s = Sphere()
+    bvh = BVH([s])
+    assert bvh.closest(Ray(Point(0, 0, 5), Vector(0, 0, 1))) is None
+    assert bvh.closest(Ray(Point(0, 2, -5), Vector(0, 0, 1))) is None
+
+  def test_bounds_pre_test(self):
+    """ Shapes whose bounds the ray misses are not intersected """
+    class CountingCylinder(Cylinder):
+      """ cylinder counting its intersect calls """
+      def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+      def intersect(self, ray):
+        self.calls += 1
+        return super().intersect(ray)
+
+    cyl = CountingCylinder()
+    cyl.transform = Matrix.translation(5, 0, 0)
+    bvh = BVH([cyl])
+    assert bvh.unbounded == [cyl]
+    bvh.intersect(Ray(Point(0, 0, -5), Vector(0, 0.3, 1)))
+    assert cyl.calls == 0
+    bvh.intersect(Ray(Point(5, 0, -5), Vector(0, 0.3, 1)))
+    assert cyl.calls == 1
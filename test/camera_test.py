@@ -1,9 +1,19 @@
 """ Camera Tests """
 
+import json
 import math
+import multiprocessing
+import os
+import zlib
+from io import BytesIO
 
-from rt.camera import Camera
+import pytest
+
+import rt.camera
+from rt.camera import Camera, init_render_worker, worker_write_tile
+from rt.canvas import Canvas
 from rt.colour import Colour
+from rt.light import PointLight
 from rt.matrix import Matrix
 from rt.transformations import Transformations
 from rt.tuple import Point, Vector
@@ -53,6 +63,25 @@ class TestCamera:
     assert r.origin == Point(0, 2, -5)
     assert r.direction == Vector(math.sqrt(2) / 2, 0, -math.sqrt(2) / 2)
 
+  def test_rays_match_ray_for_pixel(self):
+    """ The rays of a tile are exactly the rays for its pixels """
+    c = Camera(21, 11, math.pi / 3)
+    c.transform = Transformations.view_transform(Point(1, 6, -10), Point(0, 1, 0), Vector(0, 1, 0))
+    rays = list(c.rays((3, 2, 9, 7)))
+    assert [(x, y) for x, y, _ in rays] == [(x, y) for y in range(2, 7) for x in range(3, 9)]
+    for x, y, r in rays:
+      expected = c.ray_for_pixel(x, y)
+      assert (r.origin.x, r.origin.y, r.origin.z) == (expected.origin.x, expected.origin.y, expected.origin.z)
+      assert (r.direction.x, r.direction.y, r.direction.z) == (expected.direction.x, expected.direction.y, expected.direction.z)
+    assert len(list(c.rays())) == 21 * 11
+
+  def test_transform_inverse_precomputed(self):
+    """ Assigning a transform moves the ray origin """
+    c = Camera(11, 11, math.pi / 2)
+    c.transform = Matrix.translation(0, 0, 5)
+    assert c.ray_for_pixel(5, 5).origin == Point(0, 0, -5)
+    assert c.transform == Matrix.translation(0, 0, 5)
+
   def test_render_world_camera(self):
     """ Rendering a world with a camera """
     w = World.DefaultWorld()
@@ -63,3 +92,195 @@ class TestCamera:
     c.transform = Transformations.view_transform(from_p, to, up)
     image = c.render(w)
     assert image.pixel_at(5, 5) == Colour(0.38066, 0.47583, 0.2855)
+
+  def test_render_parallel_world_camera(self):
+    """ Rendering a world in parallel matches the serial render """
+    w = World.DefaultWorld()
+    c = Camera(11, 11, math.pi / 2)
+    from_p = Point(0, 0, -5)
+    to = Point(0, 0, 0)
+    up = Vector(0, 1, 0)
+    c.transform = Transformations.view_transform(from_p, to, up)
+    image = c.render_parallel(w, 2, tile_size=4)
+    expected = c.render(w)
+    assert image.pixel_at(5, 5) == Colour(0.38066, 0.47583, 0.2855)
+    for y in range(0, 11):
+      for x in range(0, 11):
+        assert image.pixel_at(x, y) == expected.pixel_at(x, y)
+
+  def test_render_png_parallel_world_camera(self):
+    """ Rendering a PNG world in parallel matches the serial render """
+    w = World.DefaultWorld()
+    c = Camera(11, 11, math.pi / 2)
+    from_p = Point(0, 0, -5)
+    to = Point(0, 0, 0)
+    up = Vector(0, 1, 0)
+    c.transform = Transformations.view_transform(from_p, to, up)
+    image = BytesIO()
+    c.render_parallel(w, 2, tile_size=4, order="hilbert").canvas_to_png(image)
+    expected = BytesIO()
+    c.render_png(w).canvas_to_png(expected)
+    assert image.getvalue() == expected.getvalue()
+
+  def test_render_resumable(self, tmp_path):
+    """ A resumed render only renders tiles its manifest does not list """
+    w = World.DefaultWorld()
+    c = Camera(11, 11, math.pi / 2)
+    c.transform = Transformations.view_transform(Point(0, 0, -5), Point(0, 0, 0), Vector(0, 1, 0))
+    path = str(tmp_path / "render.canvas")
+    expected = c.render_png(w)
+
+    canvas = c.render_resumable(w, path, 1, tile_size=4)
+    assert canvas.pixel_at(5, 5) == expected.pixel_at(5, 5)
+    canvas.write_pixel(5, 5, Colour(1, 0, 1))
+    canvas.close()
+    with open(path + ".json", "r", encoding="utf-8") as manifest_file:
+      manifest = json.load(manifest_file)
+    assert len(manifest["completed"]) == 9
+    assert manifest["scene"] == w.digest()
+
+    # every tile is done, nothing is rendered again
+    canvas = c.render_resumable(w, path, 1, tile_size=4)
+    assert canvas.pixel_at(5, 5) == Colour(1, 0, 1)
+    canvas.close()
+
+    # drop the centre tile from the manifest, only it is rendered again
+    manifest["completed"].remove([4, 4, 8, 8])
+    with open(path + ".json", "w", encoding="utf-8") as manifest_file:
+      json.dump(manifest, manifest_file)
+    canvas = c.render_resumable(w, path, 1, tile_size=4)
+    assert canvas.pixel_at(5, 5) == expected.pixel_at(5, 5)
+    canvas.close()
+
+    # a different scene starts over
+    canvas = c.render_resumable(w, path, 1, tile_size=4)
+    canvas.write_pixel(5, 5, Colour(1, 0, 1))
+    canvas.close()
+    w.lights[0].intensity = Colour(0.5, 0.5, 0.5)
+    canvas = c.render_resumable(w, path, 1, tile_size=4)
+    assert canvas.pixel_at(5, 5) == c.render_png(w).pixel_at(5, 5)
+    canvas.close()
+
+    # changing the light culling starts over too
+    canvas = c.render_resumable(w, path, 1, tile_size=4)
+    canvas.write_pixel(5, 5, Colour(1, 0, 1))
+    canvas.close()
+    w.light_cull_epsilon = 0.01
+    canvas = c.render_resumable(w, path, 1, tile_size=4)
+    assert canvas.pixel_at(5, 5) == c.render_png(w).pixel_at(5, 5)
+    canvas.close()
+
+  def test_render_resumable_killed_before_checkpoint(self, tmp_path, monkeypatch):
+    """ A render started over and killed before its first checkpoint resumes nothing """
+    w = World.DefaultWorld()
+    c = Camera(11, 11, math.pi / 2)
+    c.transform = Transformations.view_transform(Point(0, 0, -5), Point(0, 0, 0), Vector(0, 1, 0))
+    path = str(tmp_path / "render.canvas")
+    expected = c.render_png(w)
+    c.render_resumable(w, path, 1, tile_size=4).close()
+    os.remove(path)
+
+    def killed(*args, **kwargs):
+      Canvas(*args, **kwargs).close()
+      raise SystemExit
+    with monkeypatch.context() as patch:
+      patch.setattr(rt.camera, "Canvas", killed)
+      with pytest.raises(SystemExit):
+        c.render_resumable(w, path, 1, tile_size=4)
+    assert os.path.exists(path)
+    assert not os.path.exists(path + ".json")
+
+    canvas = c.render_resumable(w, path, 1, tile_size=4)
+    assert canvas.pixel_at(5, 5) == expected.pixel_at(5, 5)
+    canvas.close()
+
+  def test_render_parallel_counts_culled_lights(self):
+    """ Lights culled by the render workers are counted in the world """
+    w = World.DefaultWorld()
+    w.lights.append(PointLight(Point(10, 10, -10), Colour(0, 0, 0)))
+    c = Camera(11, 11, math.pi / 2)
+    c.transform = Transformations.view_transform(Point(0, 0, -5), Point(0, 0, 0), Vector(0, 1, 0))
+    c.render(w)
+    serial = w.culled_light_evaluations
+    assert serial > 0
+
+    w.culled_light_evaluations = 0
+    c.render_parallel(w, 2, tile_size=4)
+    assert w.culled_light_evaluations == serial
+
+  def test_render_parallel_spawn(self, monkeypatch):
+    """ Parallel renders work when workers are spawned rather than forked """
+    monkeypatch.setattr(rt.camera, "Pool", multiprocessing.get_context("spawn").Pool)
+    w = World.DefaultWorld()
+    c = Camera(11, 11, math.pi / 2)
+    c.transform = Transformations.view_transform(Point(0, 0, -5), Point(0, 0, 0), Vector(0, 1, 0))
+    image = c.render_parallel(w, 2, tile_size=4)
+    assert image.pixel_at(5, 5) == Colour(0.38066, 0.47583, 0.2855)
+
+  def test_render_to_file(self, tmp_path):
+    """ Rendering into a memory mapped canvas file matches the serial render """
+    w = World.DefaultWorld()
+    c = Camera(11, 11, math.pi / 2)
+    c.transform = Transformations.view_transform(Point(0, 0, -5), Point(0, 0, 0), Vector(0, 1, 0))
+    canvas = c.render_to_file(w, str(tmp_path / "render.canvas"), 2, tile_size=4)
+    image = BytesIO()
+    canvas.canvas_to_png(image)
+    canvas.close()
+    expected = BytesIO()
+    c.render_png(w).canvas_to_png(expected)
+    assert image.getvalue() == expected.getvalue()
+    assert (tmp_path / "render.canvas").stat().st_size == 11 * 11 * 12
+
+  def test_tiles_cover_canvas(self):
+    """ Tiles cover every pixel of the canvas exactly once """
+    c = Camera(50, 30, math.pi / 2)
+    for order in ("scanline", "spiral", "hilbert"):
+      pixels = []
+      for x_min, y_min, x_max, y_max in c.tiles(16, order):
+        pixels.extend((x, y) for y in range(y_min, y_max) for x in range(x_min, x_max))
+      assert sorted(pixels) == sorted((x, y) for y in range(0, 30) for x in range(0, 50))
+
+  def test_tiles_spiral_from_centre(self):
+    """ Spiral tile order starts at the centre of the canvas """
+    c = Camera(48, 48, math.pi / 2)
+    assert c.tiles(16, "spiral")[0] == (16, 16, 32, 32)
+
+  def test_tiles_unknown_order(self):
+    """ An unknown tile order is rejected """
+    c = Camera(48, 48, math.pi / 2)
+    with pytest.raises(ValueError):
+      c.tiles(16, "diagonal")
+
+  def test_worker_write_tile(self):
+    """ A render worker renders tiles from the scene it was initialised with """
+    w = World.DefaultWorld()
+    c = Camera(11, 11, math.pi / 2)
+    c.transform = Transformations.view_transform(Point(0, 0, -5), Point(0, 0, 0), Vector(0, 1, 0))
+    image = Canvas(11, 11)
+    init_render_worker(c, w, image)
+    assert worker_write_tile((4, 4, 7, 7)) == (4, 4, 7, 7)
+    assert image.pixel_at(5, 5) == Colour(0.38066, 0.47583, 0.2855)
+    assert image.pixel_at(3, 5) == Colour(0, 0, 0)
+    assert image.pixel_at(7, 5) == Colour(0, 0, 0)
+
+  def test_render_png_stream(self):
+    """ Streaming a render gives the same image as rendering the PNG canvas """
+    w = World.DefaultWorld()
+    c = Camera(11, 7, math.pi / 2)
+    c.transform = Transformations.view_transform(Point(0, 0, -5), Point(0, 0, 0), Vector(0, 1, 0))
+    expected = BytesIO()
+    c.render_png(w).canvas_to_png(expected)
+    streamed = BytesIO()
+    c.render_png_stream(w, streamed, flush_rows=3)
+
+    def image_data(png):
+      idat = b""
+      pos = 8
+      while pos < len(png):
+        length = int.from_bytes(png[pos:pos + 4], "big")
+        if png[pos + 4:pos + 8] == b"IDAT":
+          idat += png[pos + 8:pos + 8 + length]
+        pos += 12 + length
+      return zlib.decompress(idat)
+
+    assert image_data(streamed.getvalue()) == image_data(expected.getvalue())
@@ -1,5 +1,10 @@
 """ Canvas Tests """
-from io import StringIO
+import math
+import pickle
+import struct
+from io import BytesIO, StringIO
+
+import pytest
 
 from rt.canvas import Canvas
 from rt.colour import Colour
@@ -57,6 +62,19 @@ class TestCanvas:
 
     ppm_data.close()
 
+  def test_ppm_binary(self):
+    """ Binary PPM holds the clamped pixel bytes after its header """
+    c = Canvas(3, 2)
+    c.write_pixel(0, 0, Colour(1.5, 0, 0))
+    c.write_pixel(1, 1, Colour(0, 0.5, 0))
+    c.write_pixel(2, 1, Colour(-0.5, 0, 1))
+
+    ppm_data = BytesIO()
+    c.canvas_to_ppm_binary(ppm_data)
+    assert ppm_data.getvalue() == b"P6\n3 2\n255\n" + bytes([
+      255, 0, 0, 0, 0, 0, 0, 0, 0,
+      0, 0, 0, 0, 128, 0, 0, 0, 255])
+
   def test_ppm_long_lines(self):
     """ Splitting long lines in PPM files """
     c = Canvas(10, 2)
@@ -72,3 +90,111 @@ class TestCanvas:
     assert ppm_lines[4] == "153 255 204 153 255 204 153 255 204 153 255 204 153"
     assert ppm_lines[5] == "255 204 153 255 204 153 255 204 153 255 204 153 255 204 153 255 204"
     assert ppm_lines[6] == "153 255 204 153 255 204 153 255 204 153 255 204 153"
+
+  def test_single_framebuffer(self):
+    """ PNG rows are quantised from the float pixels """
+    c = Canvas(4, 2)
+    c.write_pixel(1, 1, Colour(0.25, 0.5, 1.5))
+    assert c.pixel_at(1, 1) == Colour(0.25, 0.5, 1.5)
+    assert c.png_row(1) == bytes([0, 0, 0, 64, 128, 255, 0, 0, 0, 0, 0, 0])
+
+  def test_nan_pixels(self):
+    """ NaN channels are exported at full intensity """
+    c = Canvas(2, 1)
+    c.write_pixel(0, 0, Colour(math.nan, 0.5, -math.nan))
+    assert c.png_row(0) == bytes([255, 128, 255, 0, 0, 0])
+    ppm_data = BytesIO()
+    c.canvas_to_ppm_binary(ppm_data)
+    assert ppm_data.getvalue() == b"P6\n2 1\n255\n" + bytes([255, 128, 255, 0, 0, 0])
+
+  def test_pfm_round_trip(self):
+    """ PFM keeps linear colours outside 0-1 """
+    c = Canvas(3, 2)
+    c.write_pixel(0, 0, Colour(1.5, -0.25, 0))
+    c.write_pixel(2, 1, Colour(0.1, 20, 0.5))
+
+    pfm_data = BytesIO()
+    c.canvas_to_pfm(pfm_data)
+    assert pfm_data.getvalue().startswith(b"PF\n3 2\n")
+    assert len(pfm_data.getvalue().split(b"\n", 3)[3]) == 3 * 2 * 3 * 4
+
+    pfm_data.seek(0)
+    read = Canvas.from_pfm(pfm_data)
+    assert read.width == 3
+    assert read.height == 2
+    for y in range(0, 2):
+      for x in range(0, 3):
+        assert read.pixel_at(x, y) == c.pixel_at(x, y)
+
+  def test_pfm_rows_bottom_to_top(self):
+    """ PFM rows run bottom to top, greyscale and big endian data are read """
+    pfm_data = BytesIO(b"Pf\n1 2\n1.0\n" + struct.pack(">ff", 0.25, 2.0))
+    c = Canvas.from_pfm(pfm_data)
+    assert c.pixel_at(0, 0) == Colour(2.0, 2.0, 2.0)
+    assert c.pixel_at(0, 1) == Colour(0.25, 0.25, 0.25)
+
+  def test_pfm_invalid(self):
+    """ Reading data that is not PFM """
+    with pytest.raises(ValueError):
+      Canvas.from_pfm(BytesIO(b"P6\n1 1\n255\n"))
+    with pytest.raises(ValueError):
+      Canvas.from_pfm(BytesIO(b"PF\n2 2\n-1.0\n" + bytes(8)))
+
+  def test_mapped_canvas(self, tmp_path):
+    """ A memory mapped canvas keeps its pixels in the file """
+    path = str(tmp_path / "pixels")
+    c = Canvas(4, 3, path=path)
+    c.write_pixel(3, 2, Colour(1.5, 0.5, -1))
+    attached = pickle.loads(pickle.dumps(c))
+    attached.write_pixel(0, 1, Colour(0, 1, 0))
+    attached.close()
+    c.flush()
+    c.close()
+
+    reopened = Canvas(4, 3, path=path)
+    assert reopened.pixel_at(3, 2) == Colour(1.5, 0.5, -1)
+    assert reopened.pixel_at(0, 1) == Colour(0, 1, 0)
+    assert reopened.pixel_at(0, 0) == Colour(0, 0, 0)
+    ppm_data = BytesIO()
+    reopened.canvas_to_ppm_binary(ppm_data)
+    assert ppm_data.getvalue()[-6:] == bytes([0, 0, 0, 255, 128, 0])
+    reopened.close()
+
+    with pytest.raises(ValueError):
+      Canvas(5, 3, path=path)
+
+  def test_export_writes(self, tmp_path):
+    """ An in memory canvas is exported in one write, a mapped one a row at a time """
+    class CountingBytesIO(BytesIO):
+      """ counts the writes made to it """
+      writes = 0
+      def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+    for canvas, writes in ((Canvas(4, 3), 1), (Canvas(4, 3, path=str(tmp_path / "pixels")), 3)):
+      ppm_data = CountingBytesIO()
+      canvas.canvas_to_ppm_binary(ppm_data)
+      assert ppm_data.writes == writes
+      assert len(ppm_data.getvalue()) == len(b"P6\n4 3\n255\n") + 4 * 3 * 3
+      pfm_data = CountingBytesIO()
+      canvas.canvas_to_pfm(pfm_data)
+      assert pfm_data.writes == writes
+      canvas.close()
+
+  def test_shared_canvas_pickle(self):
+    """ A pickled shared canvas writes to the same PNG data """
+    c = Canvas(5, 3, shared=True)
+    attached = pickle.loads(pickle.dumps(c))
+    attached.write_pixel(2, 1, Colour(1, 0.5, 0))
+
+    c.release_shared()
+    attached.release_shared()
+
+    expected = Canvas(5, 3)
+    expected.write_pixel(2, 1, Colour(1, 0.5, 0))
+    png_data = BytesIO()
+    c.canvas_to_png(png_data)
+    expected_data = BytesIO()
+    expected.canvas_to_png(expected_data)
+    assert png_data.getvalue() == expected_data.getvalue()
@@ -34,3 +34,20 @@ class TestColour:
     c1 = Colour(1, 0.2, 0.4)
     c2 = Colour(0.9, 1, 0.1)
     assert c1 * c2 == Colour(0.9, 0.2, 0.04)
+
+  def test_in_place_operators(self):
+    """ In place operators update the colour itself """
+    c = Colour(0.2, 0.3, 0.4)
+    same = c
+    c += Colour(0.1, 0.1, 0.1)
+    c *= 2
+    c *= Colour(1, 0.5, 0.25)
+    assert c is same
+    assert c == Colour(0.6, 0.4, 0.25)
+
+  def test_multiply_add(self):
+    """ Fused multiply add of colours """
+    c1 = Colour(0.2, 0.3, 0.4)
+    c2 = Colour(1, 0.5, 0)
+    assert c1.multiply_add(c2, 0.5) == Colour(0.7, 0.55, 0.4)
+    assert c1 == Colour(0.2, 0.3, 0.4)
@@ -65,3 +65,25 @@ class TestCube:
       p = test[0]
       normal = c.local_normal_at(p)
       assert normal == test[1]
+
+  def test_cube_intersect_many(self):
+    """ Intersecting a batch of rays matches intersecting each ray """
+    rays = [
+      Ray(Point(5, 0.5, 0), Vector(-1, 0, 0)),
+      Ray(Point(0.5, 0, -5), Vector(0, 0, 1)),
+      Ray(Point(0, 0.5, 0), Vector(0, 0, 1)),
+      Ray(Point(-2, 0, 0), Vector(0.2673, 0.5345, 0.8018)),
+      Ray(Point(2, 2, 0), Vector(-1, 0, 0)),
+      Ray(Point(-3, 0.25, -4), Vector(0.6, 0.1, 0.8))
+    ]
+    c = Cube()
+    origins = [(r.origin.x, r.origin.y, r.origin.z, r.origin.w) for r in rays]
+    directions = [(r.direction.x, r.direction.y, r.direction.z, r.direction.w) for r in rays]
+    near, far, hits = c.local_intersect_many(origins, directions)
+    assert hits == [True, True, True, False, False, True]
+    for i, r in enumerate(rays):
+      xs = c.intersect(r)
+      assert len(xs) == (2 if hits[i] else 0)
+      if hits[i]:
+        assert near[i] == xs[0].t
+        assert far[i] == xs[1].t
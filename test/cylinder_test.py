@@ -41,3 +41,24 @@ class TestCylinder:
       assert len(xs) == 2
       assert math.isclose(xs[0].t, test[2], abs_tol=EPSILON)
       assert math.isclose(xs[1].t, test[3], abs_tol=EPSILON)
+
+  def test_cylinder_intersect_many(self):
+    """ Intersecting a batch of rays matches intersecting each ray """
+    cyl = Cylinder()
+    rays = [
+      Ray(Point(1, 0, 0), Vector(0, 1, 0)),
+      Ray(Point(0, 0, -5), Vector(1, 1, 1).normalize()),
+      Ray(Point(1, 0, -5), Vector(0, 0, 1)),
+      Ray(Point(0, 0, -5), Vector(0, 0, 1)),
+      Ray(Point(0.5, 0, -5), Vector(0.1, 1, 1).normalize())
+    ]
+    origins = [(r.origin.x, r.origin.y, r.origin.z, r.origin.w) for r in rays]
+    directions = [(r.direction.x, r.direction.y, r.direction.z, r.direction.w) for r in rays]
+    near, far, hits = cyl.local_intersect_many(origins, directions)
+    assert hits == [False, False, True, True, True]
+    for i, r in enumerate(rays):
+      xs = cyl.intersect(r)
+      assert len(xs) == (2 if hits[i] else 0)
+      if hits[i]:
+        assert near[i] == xs[0].t
+        assert far[i] == xs[1].t
@@ -1,8 +1,10 @@
 """ Intersection Tests """
+import copy
 import math
 
 from rt.helpers import EPSILON
 from rt.intersection import Intersection, Intersections
+from rt.material import Material
 from rt.matrix import Matrix
 from rt.plane import Plane
 from rt.ray import Ray
@@ -68,6 +70,24 @@ class TestIntersection:
     i = xs.hit()
     assert i == i4
 
+  def test_hit_does_not_reorder(self):
+    """ Finding the hit leaves the intersections in their order """
+    s = Sphere()
+    i1 = Intersection(5, s)
+    i2 = Intersection(-3, s)
+    i3 = Intersection(2, s)
+    xs = Intersections(i1, i2, i3)
+    assert xs.hit() is i3
+    assert xs.xs == [i1, i2, i3]
+
+  def test_hit_ordered_intersections(self):
+    """ The hit of ordered intersections is the first nonnegative one """
+    s = Sphere()
+    xs = Intersections(Intersection(-3, s), Intersection(2, s), Intersection(5, s), ordered=True)
+    assert xs.hit() is xs[1]
+    xs = Intersections(Intersection(-3, s), Intersection(-1, s), ordered=True)
+    assert xs.hit() is None
+
   def test_precompute_intersection(self):
     """ Precomputing the state of an intersection """
     r = Ray(Point(0, 0, -5), Vector(0, 0, 1))
@@ -155,6 +175,35 @@ class TestIntersection:
       assert comps.n1 == test[0]
       assert comps.n2 == test[1]
 
+  def test_n1_n2_identical_shapes(self):
+    """ Containers are tracked by identity, not by equal shapes """
+    a = UnitTestGlassSphere()
+    b = UnitTestGlassSphere()
+    xs = Intersections(
+      Intersection(-1, a),
+      Intersection(-1, b),
+      Intersection(1, a),
+      Intersection(1, b)
+    )
+    assert xs.refractive_indices(xs[0]) == (1.0, 1.5)
+    assert xs.refractive_indices(xs[1]) == (1.5, 1.5)
+    assert xs.refractive_indices(xs[2]) == (1.5, 1.5)
+    assert xs.refractive_indices(xs[3]) == (1.5, 1.0)
+
+  def test_n1_n2_copied_shape(self):
+    """ A copied shape is a separate container """
+    a = UnitTestGlassSphere()
+    a.material.refractive_index = 1.5
+    b = copy.copy(a)
+    b.material = Material(transparency=1.0, refractive_index=2.0)
+    xs = Intersections(
+      Intersection(1, a),
+      Intersection(2, b),
+      Intersection(3, a),
+      Intersection(4, b)
+    )
+    assert [xs.refractive_indices(i) for i in xs] == [(1.0, 1.5), (1.5, 2.0), (2.0, 2.0), (2.0, 1.0)]
+
   def test_hit_offset_under_point(self):
     """ The under point is offset below the surface """
     r = Ray(Point(0, 0, -5), Vector(0, 0, 1))
@@ -1,11 +1,11 @@
 """ Material Tests """
-from math import sqrt
+from math import inf, sqrt
 
 from rt.colour import Colour
 from rt.light import PointLight
 from rt.material import Material
 from rt.sphere import Sphere
-from rt.pattern import Stripe
+from rt.pattern import Stripe, UnitTestPattern
 from rt.tuple import Point, Vector
 
 
@@ -107,3 +107,12 @@ class TestMaterial:
     m = Material()
     assert m.transparency == 0.0
     assert m.refractive_index == 1.0
+
+  def test_contribution_bound(self):
+    """ The bound on lighting covers the colour or pattern and specular """
+    m = Material(colour=Colour(0.5, 0.25, 0), ambient=0.1, diffuse=0.9, specular=0.5)
+    assert m.contribution_bound() == 1.0
+    m.pattern = Stripe(Colour(0.2, 0.2, 0.2), Colour(0, 0, 2))
+    assert m.contribution_bound() == 2.5
+    m.pattern = UnitTestPattern()
+    assert m.contribution_bound() == inf
@@ -1,4 +1,6 @@
 """ Matrix Tests """
+import pytest
+
 from rt.matrix import Matrix
 from rt.tuple import Tuple
 
@@ -312,3 +314,60 @@ class TestMatrix:
     ])
     C = A * B
     assert C * B.inverse == A
+
+  def test_matrix_inverse_matches_cofactors(self):
+    """ The 4x4 inverse matches the cofactor inverse """
+    A = Matrix([
+      [0.5, -2.25, 3, 1],
+      [4, 0.125, -1.5, 2],
+      [-3, 2, 0.75, -0.5],
+      [1, 1, -2, 6]
+    ])
+    B = A.inverse
+    for row in range(0, 4):
+      for col in range(0, 4):
+        assert abs(B[col][row] - A.cofactor(row, col) / A.determinant) < 1e-12
+    assert A * B == Matrix.identity()
+
+  def test_non_invertable_matrix_inverse(self):
+    """ Inverting a noninvertible matrix raises an error """
+    A = Matrix([
+      [-4,2,-2,-3],
+      [9,6,2,6],
+      [0,-5,1,-5],
+      [0,0,0,0]
+    ])
+    with pytest.raises(ValueError):
+      _ = A.inverse
+
+  def test_matrix_immutable(self):
+    """ Matrix elements cannot be changed """
+    A = Matrix.translation(1, 2, 3)
+    with pytest.raises(TypeError):
+      A[0][3] = 5
+
+  def test_matrix_attributes_immutable(self):
+    """ Matrix attributes cannot be reassigned once a cache is built """
+    A = Matrix.translation(1, 2, 3)
+    assert A.inverse == Matrix.translation(-1, -2, -3)
+    with pytest.raises(AttributeError):
+      A.rows = A.transpose.rows
+    with pytest.raises(AttributeError):
+      A.size = 3
+
+  def test_matrix_unhashable(self):
+    """ Matrices compare within EPSILON so they are not hashable """
+    with pytest.raises(TypeError):
+      hash(Matrix.identity())
+
+  def test_matrix_shared_inverse(self):
+    """ Identical matrices share their inverse """
+    A = Matrix.rotation_y(0.5) * Matrix.translation(5, 0, 0)
+    B = Matrix.rotation_y(0.5) * Matrix.translation(5, 0, 0)
+    assert A is not B
+    assert A.inverse is B.inverse
+
+  def test_matrix_equals_other_type(self):
+    """ Comparing a matrix to another type is not equal """
+    assert Matrix.identity() != 1
+    assert Matrix.identity() != Tuple(1, 0, 0, 0)
@@ -1,4 +1,6 @@
 """ Pattern Tests """
+import math
+
 from rt.colour import Colour
 from rt.matrix import Matrix
 from rt.pattern import Checker, Gradient, Ring, Stripe, UnitTestPattern
@@ -116,3 +118,9 @@ class TestPattern:
     assert pattern.pattern_at(Point(0, 0, 0)) == Colour.White()
     assert pattern.pattern_at(Point(0, 0, 0.99)) == Colour.White()
     assert pattern.pattern_at(Point(0, 0, 1.01)) == Colour.Black()
+
+  def test_colour_bound(self):
+    """ Two colour patterns are bounded by their brighter colour, others are unbounded """
+    for pattern_type in (Stripe, Gradient, Ring, Checker):
+      assert pattern_type(Colour(0.2, 0.5, 0.1), Colour(0.3, 0.1, 0.4)).colour_bound() == 0.5
+    assert UnitTestPattern().colour_bound() == math.inf
@@ -48,3 +48,24 @@ class TestPlane:
     assert len(xs) == 1
     assert xs[0].t == 1
     assert xs[0].object == p
+
+  def test_ray_intersect_many(self):
+    """ Intersecting a batch of rays matches intersecting each ray """
+    rays = [
+      Ray(Point(0, 10, 0), Vector(0, 0, 1)),
+      Ray(Point(0, 0, 0), Vector(0, 0, 1)),
+      Ray(Point(0, 1, 0), Vector(0, -1, 0)),
+      Ray(Point(0, -1, 0), Vector(0, 1, 0)),
+      Ray(Point(2, 3, -1), Vector(0.6, -0.64, 0.48))
+    ]
+    p = Plane()
+    origins = [(r.origin.x, r.origin.y, r.origin.z, r.origin.w) for r in rays]
+    directions = [(r.direction.x, r.direction.y, r.direction.z, r.direction.w) for r in rays]
+    near, far, hits = p.local_intersect_many(origins, directions)
+    assert hits == [False, False, True, True, True]
+    assert near == far
+    for i, r in enumerate(rays):
+      xs = p.intersect(r)
+      assert len(xs) == (1 if hits[i] else 0)
+      if hits[i]:
+        assert near[i] == xs[0].t
@@ -0,0 +1,69 @@
+""" PNG Tests """
+import zlib
+from io import BytesIO
+
+import pytest
+
+from rt.canvas import Canvas
+from rt.colour import Colour
+from rt.png import PNG_SIGNATURE, PNGWriter
+
+
+def read_chunks(png: bytes) -> list[tuple[str, bytes]]:
+  """ split PNG data into its chunk types and data """
+  assert png[:8] == PNG_SIGNATURE
+  chunks = []
+  pos = 8
+  while pos < len(png):
+    length = int.from_bytes(png[pos:pos + 4], "big")
+    chunk_type = png[pos + 4:pos + 8].decode("ascii")
+    chunks.append((chunk_type, png[pos + 8:pos + 8 + length]))
+    pos += 12 + length
+  return chunks
+
+def image_data(png: bytes) -> bytes:
+  """ decompressed scanlines of PNG data """
+  return zlib.decompress(b"".join(data for chunk_type, data in read_chunks(png) if chunk_type == "IDAT"))
+
+class TestPNG:
+  """ streaming PNG writer """
+
+  def test_streamed_matches_canvas(self):
+    """ Streamed rows decode to the same image as the canvas PNG """
+    c = Canvas(5, 4)
+    for y in range(0, 4):
+      for x in range(0, 5):
+        c.write_pixel(x, y, Colour(x / 4, y / 3, 0.5))
+    expected = BytesIO()
+    c.canvas_to_png(expected)
+
+    streamed = BytesIO()
+    with PNGWriter(streamed, 5, 4, flush_rows=1) as writer:
+      for y in range(0, 4):
+        writer.write_row(c.png_row(y))
+
+    assert [t for t, _ in read_chunks(streamed.getvalue())][0] == "IHDR"
+    assert [t for t, _ in read_chunks(streamed.getvalue())][-1] == "IEND"
+    assert read_chunks(streamed.getvalue())[0] == read_chunks(expected.getvalue())[0]
+    assert image_data(streamed.getvalue()) == image_data(expected.getvalue())
+
+  def test_partial_rows_decode(self):
+    """ Rows written before a sync flush are already decodable """
+    output = BytesIO()
+    writer = PNGWriter(output, 2, 4, flush_rows=2)
+    writer.write_row(bytes([255, 0, 0, 0, 255, 0]))
+    writer.write_row(bytes([0, 0, 255, 9, 9, 9]))
+    idat = b"".join(data for chunk_type, data in read_chunks(output.getvalue()) if chunk_type == "IDAT")
+    assert zlib.decompressobj().decompress(idat) == bytes([0, 255, 0, 0, 0, 255, 0, 0, 0, 0, 255, 9, 9, 9])
+
+  def test_row_errors(self):
+    """ Rows must be the image width and fill its height """
+    writer = PNGWriter(BytesIO(), 2, 1)
+    with pytest.raises(ValueError):
+      writer.write_row(bytes(3))
+    with pytest.raises(ValueError):
+      writer.close()
+    writer.write_row(bytes(6))
+    with pytest.raises(ValueError):
+      writer.write_row(bytes(6))
+    writer.close()
@@ -2,10 +2,12 @@
 
 from math import pi, sqrt
 
+from rt.helpers import EPSILON
 from rt.material import Material
 from rt.matrix import Matrix
 from rt.ray import Ray
 from rt.shape import UnitTestShape
+from rt.sphere import Sphere
 from rt.tuple import Point, Vector
 
 
@@ -37,6 +39,17 @@ class TestShape:
     s.material = m
     assert s.material == m
 
+  def test_identity_equality(self):
+    """ Shapes are equal only to themselves, equals compares their values """
+    a = UnitTestShape()
+    b = UnitTestShape()
+    assert a != b
+    assert a.equals(b)
+    assert len({a, b, a}) == 2
+
+    b.transform = Matrix.translation(1, 0, 0)
+    assert not a.equals(b)
+
   def test_intersect_scaled_shape_ray(self):
     """ Intersecting a scaled shape with a ray """
     r = Ray(Point(0, 0, -5), Vector(0, 0, 1))
@@ -68,3 +81,20 @@ class TestShape:
     s.transform = Matrix.scaling(1, 0.5, 1) * Matrix.rotation_z(pi / 5)
     n = s.normal_at(Point(0, sqrt(2) / 2, -sqrt(2) / 2))
     assert n == Vector(0, 0.97014, -0.24254)
+
+  def test_intersect_many_scaled_shape(self):
+    """ Intersecting a scaled shape with a batch of rays """
+    s = UnitTestShape()
+    s.transform = Matrix.scaling(2, 2, 2)
+    s.intersect_many([(0, 0, -5, 1), (4, 2, 0, 1)], [(0, 0, 1, 0), (0, 1, 0, 0)])
+    origins, directions = s.saved_rays
+    assert origins == [(0, 0, -2.5, 1), (2, 1, 0, 1)]
+    assert directions == [(0, 0, 0.5, 0), (0, 0.5, 0, 0)]
+
+  def test_bounds_follow_transform(self):
+    """ A shape's cached world bounds follow its transform """
+    s = Sphere()
+    assert s.bounds() is s.bounds()
+    s.transform = Matrix.translation(5, 0, 0)
+    assert s.bounds().minimum == Point(4 - EPSILON, -1 - EPSILON, -1 - EPSILON)
+    assert s.bounds().maximum == Point(6 + EPSILON, 1 + EPSILON, 1 + EPSILON)
@@ -155,3 +155,35 @@ class TestSphere:
     assert s.transform == Matrix.identity()
     assert s.material.transparency == 1.0
     assert s.material.refractive_index == 1.5
+
+  def test_sphere_intersect_many(self):
+    """ Intersecting a batch of rays matches intersecting each ray """
+    s = Sphere()
+    s.transform = Matrix.translation(0.5, -0.5, 2) * Matrix.scaling(2, 1, 3)
+    rays = [
+      Ray(Point(0, 0, -5), Vector(0, 0, 1)),
+      Ray(Point(0, 5, -5), Vector(0, 0, 1)),
+      Ray(Point(1, -1, 0), Vector(0.6, 0, 0.8)),
+      Ray(Point(-4, 0, -4), Vector(1, -0.1, 1).normalize())
+    ]
+    origins = [(r.origin.x, r.origin.y, r.origin.z, r.origin.w) for r in rays]
+    directions = [(r.direction.x, r.direction.y, r.direction.z, r.direction.w) for r in rays]
+    near, far, hits = s.intersect_many(origins, directions)
+    assert hits == [True, False, True, True]
+    for i, r in enumerate(rays):
+      xs = s.intersect(r)
+      if hits[i]:
+        assert near[i] == xs[0].t
+        assert far[i] == xs[1].t
+      else:
+        assert len(xs) == 0
+
+  def test_sphere_occludes(self):
+    """ A sphere occludes a ray only within the given distance """
+    s = Sphere()
+    s.transform = Matrix.translation(0, 0, 5)
+    r = Ray(Point(0, 0, 0), Vector(0, 0, 1))
+    assert s.occludes(r, 10) is True
+    assert s.occludes(r, 3.5) is False
+    r = Ray(Point(0, 0, 10), Vector(0, 0, 1))
+    assert s.occludes(r, 10) is False
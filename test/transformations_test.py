@@ -146,6 +146,24 @@ class TestTransformations:
     T = C * B * A
     assert T * p == Point(15, 0, 7)
 
+  def test_transform_fluent(self):
+    """ Fluent transformations are applied in call order """
+    p = Point(1, 0, 1)
+    T = Matrix.identity().rotate_x(math.pi / 2).scale(5, 5, 5).translate(10, 5, 7)
+    assert T == Matrix.translation(10, 5, 7) * Matrix.scaling(5, 5, 5) * Matrix.rotation_x(math.pi / 2)
+    assert T * p == Point(15, 0, 7)
+
+  def test_transform_fluent_inverse(self, monkeypatch):
+    """ Fluent transformations carry their inverse without inverting """
+    T = Matrix.identity().shear(1, 0, 0, 0, 0, 1).rotate_y(math.pi / 3).rotate_z(0.5).scale(2, 3, 4).translate(-1, 2, 5)
+    expected = Matrix.translation(-1, 2, 5) * Matrix.scaling(2, 3, 4) * Matrix.rotation_z(0.5) * \
+      Matrix.rotation_y(math.pi / 3) * Matrix.shearing(1, 0, 0, 0, 0, 1)
+    expected_inverse = expected.inverse
+    def no_invert(rows):
+      raise AssertionError("fluent chain inverted its matrix")
+    monkeypatch.setattr(Matrix, "_invert", staticmethod(no_invert))
+    assert T.inverse == expected_inverse
+
   def test_view_transformation_matrix_default(self):
     """ The transformation matrix for the default orientation """
     eye_from = Point(0, 0, 0)
@@ -144,3 +144,29 @@ class TestTuple:
     n = Vector(sqrt(2) / 2, sqrt(2) / 2, 0)
     r = v.reflect(n)
     assert r == Vector(1, 0, 0)
+
+  def test_in_place_operators(self):
+    """ In place operators update the tuple itself """
+    a = Vector(1, -2, 3)
+    same = a
+    a += Vector(1, 1, 1)
+    a -= Vector(0, 1, 0)
+    a *= 2
+    a /= 4
+    assert a is same
+    assert a == Vector(1, -1, 2)
+    assert a.w == 0
+
+  def test_multiply_add(self):
+    """ Fused multiply add of a point and a scaled vector """
+    p = Point(1, 2, 3)
+    v = Vector(1, 0, -1)
+    assert p.multiply_add(v, 2) == p + v * 2
+    assert p == Point(1, 2, 3)
+
+  def test_reflect_into(self):
+    """ Reflecting a vector into itself """
+    v = Vector(1, -1, 0)
+    r = v.reflect_into(Vector(0, 1, 0), v)
+    assert r is v
+    assert v == Vector(1, 1, 0)
@@ -1,5 +1,6 @@
 """ World Tests """
 import math
+import pickle
 
 from rt.colour import Colour
 from rt.intersection import Intersection, Intersections
@@ -28,12 +29,12 @@ class TestWorld:
     w = World.DefaultWorld()
     assert w.lights[0] == PointLight(Point(-10, 10, -10), Colour(1, 1, 1))
 
-    assert w.objects[0] == Sphere(material=Material(
+    assert w.objects[0].equals(Sphere(material=Material(
       colour=Colour(0.8, 1.0, 0.6),
       diffuse=0.7,
-      specular=0.2))
+      specular=0.2)))
 
-    assert w.objects[1] == Sphere(transform=Matrix.scaling(0.5, 0.5, 0.5))
+    assert w.objects[1].equals(Sphere(transform=Matrix.scaling(0.5, 0.5, 0.5)))
 
   def test_intersect_world_ray(self):
     """ Intersect a world with a ray """
@@ -306,3 +307,146 @@ class TestWorld:
     comps = xs[0].prepare_computations(r, xs)
     colour = w.shade_hit(comps, 5)
     assert colour == Colour(0.93391, 0.69643, 0.69243)
+
+  def test_intersect_world_rebuilds_bvh(self):
+    """ Intersecting the world sees objects added or moved since the last ray """
+    w = World.DefaultWorld()
+    r = Ray(Point(0, 0, -5), Vector(0, 0, 1))
+    assert len(w.intersect(r)) == 4
+
+    s = Sphere()
+    s.transform = Matrix.translation(0, 0, 5)
+    w.objects.append(s)
+    assert len(w.intersect(r)) == 6
+
+    s.transform = Matrix.translation(0, 5, 5)
+    assert len(w.intersect(r)) == 4
+
+    w.objects = [s]
+    assert len(w.intersect(r)) == 0
+
+  def test_assign_objects_snapshot(self):
+    """ Assigning objects copies the list, later changes go through world.objects """
+    w = World()
+    shapes = [Sphere()]
+    w.objects = shapes
+    shapes.append(Sphere())
+    assert len(w.objects) == 1
+    w.objects.append(shapes[1])
+    assert len(w.objects) == 2
+    assert len(shapes) == 2
+
+  def test_bvh_ignores_other_shapes(self):
+    """ Moving or making shapes outside the world keeps its BVH """
+    w = World.DefaultWorld()
+    bvh = w.bvh
+    s = Sphere()
+    s.transform = Matrix.translation(0, 0, 5)
+    other = World()
+    other.objects.append(s)
+    s.transform = Matrix.translation(0, 5, 5)
+    assert w.bvh is bvh
+
+    w.objects[1].transform = Matrix.scaling(0.25, 0.25, 0.25)
+    assert w.bvh is not bvh
+
+  def test_occluded(self):
+    """ Occlusion between a point and a light position """
+    w = World.DefaultWorld()
+    light_position = Point(-10, 10, -10)
+    assert w.occluded(Point(10, -10, 10), light_position) is True
+    assert w.occluded(Point(0, 10, 0), light_position) is False
+    assert w.occluded(Point(-20, 20, -20), light_position) is False
+    assert w.occluded(Point(-2, 2, -2), light_position) is False
+
+  def test_closest_hit(self):
+    """ The closest hit of a ray is the hit of its intersections """
+    w = World.DefaultWorld()
+    r = Ray(Point(0, 0, -5), Vector(0, 0, 1))
+    hit = w.closest_hit(r)
+    assert hit.t == 4
+    assert hit.object is w.objects[0]
+
+    r = Ray(Point(0, 0, 0), Vector(0, 0, 1))
+    hit = w.closest_hit(r)
+    assert hit.t == 0.5
+    assert hit.object is w.objects[1]
+
+    r = Ray(Point(0, 0, -5), Vector(0, 1, 0))
+    assert w.closest_hit(r) is None
+
+  def test_digest(self):
+    """ The scene digest follows what the scene renders, not object ids """
+    assert World.DefaultWorld().digest() == World.DefaultWorld().digest()
+    w = World.DefaultWorld()
+    w.objects[1].material.transparency = 0.5
+    assert w.digest() != World.DefaultWorld().digest()
+    w = World.DefaultWorld()
+    w.lights[0].position = Point(-10, 10, -9)
+    assert w.digest() != World.DefaultWorld().digest()
+    w = World.DefaultWorld()
+    w.light_cull_epsilon = 0.01
+    assert w.digest() != World.DefaultWorld().digest()
+
+  def test_shade_hit_multiple_lights(self):
+    """ Shading sums the lighting from every light """
+    w = World.DefaultWorld()
+    r = Ray(Point(0, 0, -5), Vector(0, 0, 1))
+    shape = w.objects[0]
+    i = Intersection(4, shape)
+    comps = i.prepare_computations(r)
+    first = w.shade_hit(comps)
+
+    second = PointLight(Point(10, 10, -10), Colour(0.5, 0.5, 0.5))
+    w.lights = [second]
+    expected = first + w.shade_hit(comps)
+
+    w.lights = [PointLight(Point(-10, 10, -10), Colour(1, 1, 1)), second]
+    assert w.shade_hit(comps) == expected
+
+  def test_shade_hit_skips_shadow_rays(self):
+    """ Lights behind the surface or with no intensity cast no shadow rays """
+    w = World.DefaultWorld()
+    r = Ray(Point(0, 0, -5), Vector(0, 0, 1))
+    comps = Intersection(4, w.objects[0]).prepare_computations(r)
+    w.lights = [
+      PointLight(Point(0, 0, 10), Colour(1, 1, 1)),
+      PointLight(Point(-10, 10, -10), Colour(0, 0, 0))]
+
+    shadow_rays = []
+    occluded = w.occluded
+    w.occluded = lambda point, position: shadow_rays.append(position) or occluded(point, position)
+    colour = w.shade_hit(comps)
+    assert not shadow_rays
+    assert colour == Colour(0.08, 0.1, 0.06)
+
+  def test_shadow_per_light(self):
+    """ A point can be shadowed from one light and lit by another """
+    w = World.DefaultWorld()
+    p = Point(10, -10, 10)
+    assert w.is_shadowed(p) is True
+    assert w.is_shadowed(p, PointLight(Point(10, 10, 10), Colour(1, 1, 1))) is False
+
+  def test_light_culling(self):
+    """ Lights too dim to matter are culled and counted """
+    w = World.DefaultWorld()
+    r = Ray(Point(0, 0, -5), Vector(0, 0, 1))
+    comps = Intersection(4, w.objects[0]).prepare_computations(r)
+    expected = w.shade_hit(comps)
+    assert w.culled_light_evaluations == 0
+
+    w.lights.append(PointLight(Point(10, 10, -10), Colour(0.001, 0.001, 0.001)))
+    assert w.shade_hit(comps) != expected
+    assert w.culled_light_evaluations == 0
+
+    w.light_cull_epsilon = 0.01
+    assert w.shade_hit(comps) == expected
+    assert w.culled_light_evaluations == 1
+
+  def test_pickle_world(self):
+    """ A world survives pickling, as it does when sent to spawned workers """
+    w = pickle.loads(pickle.dumps(World.DefaultWorld()))
+    assert len(w.objects) == 2
+    w.objects.append(Sphere())
+    r = Ray(Point(0, 0, -5), Vector(0, 0, 1))
+    assert len(w.intersect(r)) == 6